@@ -13,6 +13,7 @@ from loguru import logger
 
 from .config import settings
 from .routers import health, route, plan, memory, feedback, ask, execute, ui_proxy, judgment
+from .services.multi_agent_chat import close_http_client
 
 
 # Configure loguru
@@ -32,6 +33,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"Database: {settings.database_url}")
     yield
     logger.info("👋 Quillo Agent shutting down...")
+    await close_http_client()
 
 
 def create_app() -> FastAPI:
@@ -3,8 +3,11 @@ UI Proxy (BFF) router - Frontend-facing endpoints without API key exposure
 """
 import hmac
 import os
+import uuid
 from typing import Optional, List
+import orjson
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from loguru import logger
@@ -35,7 +38,7 @@ from ..services import quillo, advice, memory as memory_service
 from ..services.execution import execution_service
 from ..services.judgment import assess_stakes, build_explanation, format_for_user
 from ..services.interaction_contract import enforce_contract, ActionIntent
-from ..services.multi_agent_chat import run_multi_agent_chat
+from ..services.multi_agent_chat import run_multi_agent_chat, stream_normal_mode_peers
 from ..services.evidence import retrieve_evidence
 from ..services.tasks.service import TaskIntentService
 from ..services.tasks.plan_service import TaskPlanService
@@ -67,6 +70,14 @@ limiter = Limiter(key_func=get_remote_address, enabled=(os.getenv("PYTEST_RUNNIN
 
 router = APIRouter(prefix="/ui/api", tags=["ui-proxy"])
 
+# Multi-agent mode values that select Work mode; anything else (or nothing) is Normal mode
+WORK_MODES = frozenset({"work"})
+
+
+def _resolve_mode(mode: Optional[str]) -> str:
+    """Normalize a requested multi-agent mode to "work" or "normal" (case-insensitive)."""
+    return "work" if (mode or "").strip().lower() in WORK_MODES else "normal"
+
 
 class AuthStatusResponse(BaseModel):
     """Auth status response (never exposes secrets)"""
@@ -488,7 +499,6 @@ async def ui_ask_quillopreneur(
     Returns:
         AskResponse with answer, model, and trace_id
     """
-    import uuid
     logger.info(f"UI POST /ask: user_id={payload.user_id}, trust_contract=v1")
 
     # Generate trace ID
@@ -730,7 +740,6 @@ async def ui_execute_plan(
     Returns:
         ExecuteResponse with output_text, artifacts, trace_id, provider, warnings
     """
-    import uuid
     logger.info(f"UI POST /execute: intent={payload.intent}, user_id={payload.user_id}, dry_run={payload.dry_run}")
 
     # Generate trace ID
@@ -787,11 +796,9 @@ async def ui_multi_agent_chat(
     Returns:
         MultiAgentResponse with messages, provider, trace_id
     """
-    import uuid
-
     # Determine mode (default to "normal", case-insensitive)
-    request_mode = (payload.mode or "normal").lower()
-    normal_mode = request_mode != "work"
+    request_mode = _resolve_mode(payload.mode)
+    normal_mode = request_mode == "normal"
 
     logger.info(f"UI POST /multi-agent: user_id={payload.user_id}, mode={request_mode}, normal_mode={normal_mode}")
 
@@ -912,7 +919,9 @@ async def ui_multi_agent_chat(
         )
 
     # TRUST CONTRACT STEP 2: Check if evidence is needed
-    needs_evidence = classify_prompt_needs_evidence(payload.text)
+    # (offline, the template transcript ignores evidence, so don't fetch it;
+    # the "Evidence: on" disclosure is then omitted, since nothing was used)
+    needs_evidence = bool(settings.openrouter_api_key) and classify_prompt_needs_evidence(payload.text)
     evidence_context = None
 
     if needs_evidence:
@@ -980,6 +989,65 @@ async def ui_multi_agent_chat(
     )
 
 
+@router.post("/multi-agent/stream")
+@limiter.limit("30/minute")
+async def ui_multi_agent_chat_stream(
+    request: Request,
+    payload: MultiAgentRequest,
+    token: str = Depends(verify_ui_token)
+) -> StreamingResponse:
+    """
+    Stream Normal-mode multi-agent replies as Server-Sent Events.
+
+    Each peer message is sent as a `data:` event as soon as that peer answers,
+    so the UI can render Claude/DeepSeek/Gemini as they arrive instead of
+    waiting for the slowest one. A final `done` event carries the trace_id,
+    provider and peers_unavailable, matching the non-streaming response.
+
+    Work mode (trust contract, evidence, synthesis) needs the full transcript
+    and stays on POST /ui/api/multi-agent; requests with mode="work" are
+    rejected with 422 rather than silently answered in Normal mode.
+
+    Rate limited to 30 requests per minute per IP.
+
+    Args:
+        request: FastAPI request (for rate limiting)
+        payload: MultiAgentRequest with text and user_id
+        token: Validated UI token
+
+    Returns:
+        text/event-stream of MultiAgentMessage events followed by a done event
+
+    Raises:
+        HTTPException: 422 if Work mode is requested
+    """
+    if _resolve_mode(payload.mode) == "work":
+        raise HTTPException(
+            status_code=422,
+            detail="Work mode is not streamed; use POST /ui/api/multi-agent"
+        )
+
+    trace_id = str(uuid.uuid4())
+    provider = "openrouter" if settings.openrouter_api_key else "template"
+    logger.info(f"UI POST /multi-agent/stream: user_id={payload.user_id}, provider={provider}, trace_id={trace_id}")
+
+    async def events():
+        live_peer_count = 0
+        async for message in stream_normal_mode_peers(payload.text, trace_id=trace_id):
+            if message["live"]:
+                live_peer_count += 1
+            yield b"data: " + orjson.dumps(MultiAgentMessage(**message).model_dump()) + b"\n\n"
+        done = {
+            "trace_id": trace_id,
+            "provider": provider,
+            # Same meaning as MultiAgentResponse.peers_unavailable: live provider, no peer answered
+            "peers_unavailable": provider == "openrouter" and live_peer_count == 0
+        }
+        yield b"event: done\ndata: " + orjson.dumps(done) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.post("/evidence", response_model=EvidenceResponse)
 @limiter.limit("30/minute")
 async def ui_evidence_retrieval(
@@ -16,6 +16,7 @@ CONTRACT RULES:
 - Proactive agent suggestions (v1): suggest additional agents when helpful, user must consent
 - RAW_CHAT_MODE: disables suggestions, direct LLM responses only
 """
+import re
 from enum import Enum
 from typing import Literal, Optional, Dict, Any, List
 from loguru import logger
@@ -63,6 +64,12 @@ FORBIDDEN_PHRASES = [
     "processing",
 ]
 
+# All forbidden phrases as one case-insensitive pattern (single scan per check)
+FORBIDDEN_PHRASES_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in FORBIDDEN_PHRASES),
+    re.IGNORECASE
+)
+
 
 def enforce_contract(
     message: str,
@@ -436,9 +443,9 @@ def validate_no_leakage(text: str) -> bool:
     Raises:
         ValueError: If forbidden phrases detected (for testing)
     """
-    text_lower = text.lower()
-    for phrase in FORBIDDEN_PHRASES:
-        if phrase in text_lower:
-            logger.error(f"Contract violation: forbidden phrase '{phrase}' detected in: {text}")
-            raise ValueError(f"Contract violation: forbidden phrase '{phrase}' detected")
+    match = FORBIDDEN_PHRASES_RE.search(text)
+    if match:
+        phrase = match.group(0).lower()
+        logger.error(f"Contract violation: forbidden phrase '{phrase}' detected in: {text}")
+        raise ValueError(f"Contract violation: forbidden phrase '{phrase}' detected")
     return True
@@ -206,6 +206,15 @@ def _craft_recommendation(recommendation: str, stakes: StakeLevel) -> str:
         return f"{recommendation}"
 
 
+# Output templates keyed by (has why_it_matters, requires_confirmation)
+_FORMAT_TEMPLATES = {
+    (False, False): "{what_i_see}\n\n{recommendation}",
+    (True, False): "{what_i_see}\n\n{why_it_matters}\n\n{recommendation}",
+    (False, True): "{what_i_see}\n\n{recommendation}\n\nWant me to proceed?",
+    (True, True): "{what_i_see}\n\n{why_it_matters}\n\n{recommendation}\n\nWant me to proceed?",
+}
+
+
 def format_for_user(explanation: Dict[str, Any]) -> str:
     """
     Format an explanation dict into a user-friendly message.
@@ -216,20 +225,8 @@ def format_for_user(explanation: Dict[str, Any]) -> str:
     Returns:
         Formatted string ready for display
     """
-    parts = []
-
-    # What I'm seeing
-    parts.append(explanation["what_i_see"])
-
-    # Why it matters (if present)
-    if explanation.get("why_it_matters"):
-        parts.append(f"\n\n{explanation['why_it_matters']}")
-
-    # Recommendation
-    parts.append(f"\n\n{explanation['recommendation']}")
-
-    # Confirmation prompt
-    if explanation["requires_confirmation"]:
-        parts.append("\n\nWant me to proceed?")
-
-    return "".join(parts)
+    template = _FORMAT_TEMPLATES[(
+        bool(explanation.get("why_it_matters")),
+        bool(explanation["requires_confirmation"])
+    )]
+    return template.format_map(explanation)
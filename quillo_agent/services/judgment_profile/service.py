@@ -9,7 +9,9 @@ CRITICAL RULES:
 - Max payload size: 20KB
 """
 import json
-from typing import Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 from loguru import logger
@@ -40,11 +42,46 @@ ALLOWED_ENUMS = {
 MAX_PAYLOAD_SIZE = 20 * 1024
 
 
+# In-process read-through cache for get_profile
+# (user_key -> (version, profile_json, updated_at)). Entries hold the stored
+# JSON string, not dicts, so callers can't mutate cached state; get_profile
+# builds a fresh dict on every hit. Invalidated by upsert_profile/delete_profile.
+# Single-process only: other workers writing the same user_key will not evict
+# this process's entry.
+PROFILE_CACHE_MAX_SIZE = 10_000
+_profile_cache: "OrderedDict[str, Tuple[str, str, str]]" = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+
 class JudgmentProfileValidationError(ValueError):
     """Raised when judgment profile validation fails"""
     pass
 
 
+def _cache_get(user_key: str) -> Optional[Tuple[str, str, str]]:
+    """Return the cached (version, profile_json, updated_at) for user_key (marking it recently used)."""
+    with _profile_cache_lock:
+        cached = _profile_cache.get(user_key)
+        if cached is not None:
+            _profile_cache.move_to_end(user_key)
+        return cached
+
+
+def _cache_put(user_key: str, entry: Tuple[str, str, str]) -> None:
+    """Store (version, profile_json, updated_at) for user_key, evicting the least recently used entry."""
+    with _profile_cache_lock:
+        _profile_cache[user_key] = entry
+        _profile_cache.move_to_end(user_key)
+        if len(_profile_cache) > PROFILE_CACHE_MAX_SIZE:
+            _profile_cache.popitem(last=False)
+
+
+def _cache_invalidate(user_key: str) -> None:
+    """Drop any cached profile data for user_key."""
+    with _profile_cache_lock:
+        _profile_cache.pop(user_key, None)
+
+
 def validate_profile(profile: Dict[str, Any]) -> None:
     """
     Validate judgment profile against v1 schema rules.
@@ -133,6 +170,12 @@ def get_profile(db: Session, user_key: str) -> Optional[Dict[str, Any]]:
     """
     Get judgment profile for a user.
 
+    Served from the in-process cache when possible; falls back to the
+    database on a miss. Missing profiles are not cached. Every call returns
+    a freshly built dict, so callers may modify it. The cache is per process:
+    with several workers, a profile updated through one worker can be served
+    stale by another until that worker's entry is rewritten or evicted.
+
     Args:
         db: Database session
         user_key: User identifier
@@ -140,16 +183,27 @@ def get_profile(db: Session, user_key: str) -> Optional[Dict[str, Any]]:
     Returns:
         Profile dictionary if exists, None otherwise
     """
+    cached = _cache_get(user_key)
+    if cached is not None:
+        version, profile_json, updated_at = cached
+        return {
+            "version": version,
+            "profile": json.loads(profile_json),
+            "updated_at": updated_at
+        }
+
     profile_record = repo.get_by_user_key(db, user_key)
     if not profile_record:
         return None
 
     try:
         profile_data = json.loads(profile_record.profile_json)
+        updated_at = profile_record.updated_at.isoformat()
+        _cache_put(user_key, (profile_record.version, profile_record.profile_json, updated_at))
         return {
             "version": profile_record.version,
             "profile": profile_data,
-            "updated_at": profile_record.updated_at.isoformat()
+            "updated_at": updated_at
         }
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in profile for user_key={user_key}: {e}")
@@ -183,13 +237,14 @@ def upsert_profile(
     # Convert to JSON string
     profile_json = json.dumps(profile, separators=(',', ':'))
 
-    # Save to database
+    # Save to database, then drop the cached copy so the next read sees the new row
     profile_record = repo.upsert_for_user(
         db=db,
         user_key=user_key,
         profile_json=profile_json,
         version="judgment_profile_v1"
     )
+    _cache_invalidate(user_key)
 
     return {
         "version": profile_record.version,
@@ -209,7 +264,9 @@ def delete_profile(db: Session, user_key: str) -> bool:
     Returns:
         True if profile was deleted, False if profile didn't exist
     """
-    return repo.delete_for_user(db, user_key)
+    deleted = repo.delete_for_user(db, user_key)
+    _cache_invalidate(user_key)
+    return deleted
 
 
 def profile_exists(db: Session, user_key: str) -> bool:
@@ -226,6 +283,9 @@ def profile_exists(db: Session, user_key: str) -> bool:
     Returns:
         True if profile exists, False otherwise
     """
+    if _cache_get(user_key) is not None:
+        return True
+
     try:
         profile = repo.get_by_user_key(db, user_key)
         return profile is not None
@@ -8,13 +8,16 @@ Multi-agent conversation with 4 peer agents:
 - Gemini gives alternative angle / structured take
 - Primary (Quillo) synthesizes
 
-No tools execution. No streaming. Just conversation.
+No tools execution. Just conversation (Normal-mode peers can also be streamed).
 Feature: Prompt mode (raw vs tuned) for future specialist prompts.
 """
+import asyncio
 import uuid
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, Optional
 from loguru import logger
 import httpx
+import orjson
 
 from ..config import settings
 
@@ -25,10 +28,51 @@ CHALLENGER_MODEL = settings.openrouter_challenger_agent_model  # DeepSeek (repla
 GEMINI_MODEL = settings.openrouter_gemini_agent_model
 PRIMARY_MODEL = settings.openrouter_chat_model  # GPT-4o-mini (or GPT-4o)
 
+# Peer agents in transcript order, with the model each one runs on
+PEER_MODELS = (
+    ("claude", CLAUDE_MODEL),
+    ("deepseek", CHALLENGER_MODEL),
+    ("gemini", GEMINI_MODEL),
+)
+
+# Shared OpenRouter client so peer and synthesis calls reuse pooled connections
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared OpenRouter HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            # Keep idle connections well past httpx's 5s default so back-to-back
+            # requests skip a fresh TLS handshake to OpenRouter
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared OpenRouter HTTP client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Minimal Normal-mode system prompts (no trust contract, no scaffolding)
+NORMAL_MODE_PROMPTS = {
+    "claude": "You are Claude. Respond naturally and concisely to the user's question.",
+    "deepseek": "You are DeepSeek. Respond naturally and concisely. Feel free to offer contrarian views if appropriate.",
+    "gemini": "You are Gemini. Respond naturally and concisely with a systematic perspective.",
+}
 
+
+@lru_cache()
 def _get_agent_prompt(agent_name: str, mode: str = "raw", stress_test_mode: bool = False) -> str:
     """
     Get system prompt for an agent with TRUST CONTRACT + STRESS TEST v1 enforcement.
+    Prompts depend only on the arguments, so each combination is built once and cached.
 
     TRUST CONTRACT requirements (all modes):
     - Structured output: Evidence / Interpretation / Recommendation
@@ -161,12 +205,7 @@ def _get_agent_prompt_normal(agent_name: str) -> str:
     Returns:
         Minimal system prompt string
     """
-    prompts = {
-        "claude": "You are Claude. Respond naturally and concisely to the user's question.",
-        "deepseek": "You are DeepSeek. Respond naturally and concisely. Feel free to offer contrarian views if appropriate.",
-        "gemini": "You are Gemini. Respond naturally and concisely with a systematic perspective.",
-    }
-    return prompts.get(agent_name, "Respond naturally and concisely.")
+    return NORMAL_MODE_PROMPTS.get(agent_name, "Respond naturally and concisely.")
 
 
 async def run_multi_agent_chat(
@@ -356,89 +395,22 @@ async def _generate_openrouter_transcript(
             return _get_agent_prompt_normal(agent_name)
         return _get_agent_prompt(agent_name, mode=prompt_mode, stress_test_mode=stress_test_mode)
 
-    # Message 2: Claude perspective (safe call)
-    claude_content, claude_reason = await _call_openrouter_safe(
-        model=CLAUDE_MODEL,
-        system_prompt=get_prompt("claude"),
-        user_message=user_message,
-        agent_name="claude",
-        trace_id=trace_id
-    )
-    if claude_content:
-        peer_responses["claude"] = claude_content
-        messages.append({
-            "role": "assistant",
-            "agent": "claude",
-            "content": claude_content,
-            "model_id": CLAUDE_MODEL,
-            "live": True,
-            "unavailable_reason": None
-        })
-    else:
-        messages.append({
-            "role": "assistant",
-            "agent": "claude",
-            "content": _generate_unavailable_message("claude", claude_reason),
-            "model_id": CLAUDE_MODEL,
-            "live": False,
-            "unavailable_reason": claude_reason
-        })
-
-    # Message 3: DeepSeek perspective (safe call)
-    deepseek_content, deepseek_reason = await _call_openrouter_safe(
-        model=CHALLENGER_MODEL,
-        system_prompt=get_prompt("deepseek"),
-        user_message=user_message,
-        agent_name="deepseek",
-        trace_id=trace_id
-    )
-    if deepseek_content:
-        peer_responses["deepseek"] = deepseek_content
-        messages.append({
-            "role": "assistant",
-            "agent": "deepseek",
-            "content": deepseek_content,
-            "model_id": CHALLENGER_MODEL,
-            "live": True,
-            "unavailable_reason": None
-        })
-    else:
-        messages.append({
-            "role": "assistant",
-            "agent": "deepseek",
-            "content": _generate_unavailable_message("deepseek", deepseek_reason),
-            "model_id": CHALLENGER_MODEL,
-            "live": False,
-            "unavailable_reason": deepseek_reason
-        })
-
-    # Message 4: Gemini perspective (safe call)
-    gemini_content, gemini_reason = await _call_openrouter_safe(
-        model=GEMINI_MODEL,
-        system_prompt=get_prompt("gemini"),
-        user_message=user_message,
-        agent_name="gemini",
-        trace_id=trace_id
-    )
-    if gemini_content:
-        peer_responses["gemini"] = gemini_content
-        messages.append({
-            "role": "assistant",
-            "agent": "gemini",
-            "content": gemini_content,
-            "model_id": GEMINI_MODEL,
-            "live": True,
-            "unavailable_reason": None
-        })
-    else:
-        messages.append({
-            "role": "assistant",
-            "agent": "gemini",
-            "content": _generate_unavailable_message("gemini", gemini_reason),
-            "model_id": GEMINI_MODEL,
-            "live": False,
-            "unavailable_reason": gemini_reason
-        })
+    # Messages 2-4: Claude, DeepSeek and Gemini perspectives, called concurrently.
+    # _call_openrouter_safe never raises, so one failing peer can't cancel the others.
+    peer_results = await asyncio.gather(*(
+        _call_openrouter_safe(
+            model=model,
+            system_prompt=get_prompt(agent_name),
+            user_message=user_message,
+            agent_name=agent_name,
+            trace_id=trace_id
+        )
+        for agent_name, model in PEER_MODELS
+    ))
+    for (agent_name, model), (content, reason) in zip(PEER_MODELS, peer_results):
+        if content:
+            peer_responses[agent_name] = content
+        messages.append(_peer_message(agent_name, model, content, reason))
 
     # Message 5: Primary synthesis (Work mode only)
     if not normal_mode:
@@ -481,12 +453,85 @@ async def _generate_openrouter_transcript(
     return messages
 
 
+async def stream_normal_mode_peers(
+    text: str,
+    trace_id: Optional[str] = None
+) -> AsyncIterator[dict]:
+    """
+    Yield Normal-mode peer messages as soon as each peer call finishes.
+
+    Peers run concurrently and arrive in completion order, not transcript order.
+    Closing the generator early cancels any peer calls still in flight.
+    Without an OpenRouter key, the template peer messages are yielded instead.
+
+    Args:
+        text: User's input text
+        trace_id: Optional trace ID for logging
+
+    Yields:
+        Message dicts with {role, agent, content, model_id, live, unavailable_reason}
+    """
+    if not settings.openrouter_api_key:
+        logger.info(f"[{trace_id}] OpenRouter key missing, streaming template responses")
+        for message in _generate_template_transcript(text, normal_mode=True):
+            yield message
+        return
+
+    async def call_peer(agent_name: str, model: str) -> dict:
+        content, reason = await _call_openrouter_safe(
+            model=model,
+            system_prompt=_get_agent_prompt_normal(agent_name),
+            user_message=text,
+            agent_name=agent_name,
+            trace_id=trace_id
+        )
+        return _peer_message(agent_name, model, content, reason)
+
+    tasks = [asyncio.ensure_future(call_peer(agent_name, model)) for agent_name, model in PEER_MODELS]
+    try:
+        for next_message in asyncio.as_completed(tasks):
+            yield await next_message
+    finally:
+        # Client went away (generator closed) or a peer call raised: stop the
+        # OpenRouter calls still in flight instead of letting them run on
+        for task in tasks:
+            task.cancel()
+
+
+def _peer_message(agent_name: str, model: str, content: Optional[str], reason: Optional[str]) -> dict:
+    """Build a peer transcript message, or its unavailable placeholder if the call failed."""
+    if content:
+        return {
+            "role": "assistant",
+            "agent": agent_name,
+            "content": content,
+            "model_id": model,
+            "live": True,
+            "unavailable_reason": None
+        }
+    return {
+        "role": "assistant",
+        "agent": agent_name,
+        "content": _generate_unavailable_message(agent_name, reason),
+        "model_id": model,
+        "live": False,
+        "unavailable_reason": reason
+    }
+
+
 def _generate_short_frame(text: str) -> str:
     """Generate a short framing message for Primary."""
     # Keep it simple for v0.1
     return "Got it. Let me bring in a few perspectives on this. We'll hear from Claude, DeepSeek, and Gemini."
 
 
+# Reason bucket for HTTP error statuses; any other status is "http_error"
+STATUS_REASONS = {
+    429: "rate_limited",
+    404: "not_found",
+}
+
+
 async def _call_openrouter_safe(
     model: str,
     system_prompt: str,
@@ -514,15 +559,9 @@ async def _call_openrouter_safe(
         logger.error(f"event=multiagent_call_failed agent={agent_name} model={model} error_type=timeout trace_id={trace_id}")
         return (None, "timeout")
     except httpx.HTTPStatusError as e:
-        if e.response.status_code == 429:
-            logger.error(f"event=multiagent_call_failed agent={agent_name} model={model} status_code={e.response.status_code} error_type=rate_limited trace_id={trace_id}")
-            return (None, "rate_limited")
-        elif e.response.status_code == 404:
-            logger.error(f"event=multiagent_call_failed agent={agent_name} model={model} status_code={e.response.status_code} error_type=not_found trace_id={trace_id}")
-            return (None, "not_found")
-        else:
-            logger.error(f"event=multiagent_call_failed agent={agent_name} model={model} status_code={e.response.status_code} error_type=http_error trace_id={trace_id}")
-            return (None, "http_error")
+        reason = STATUS_REASONS.get(e.response.status_code, "http_error")
+        logger.error(f"event=multiagent_call_failed agent={agent_name} model={model} status_code={e.response.status_code} error_type={reason} trace_id={trace_id}")
+        return (None, reason)
     except Exception as e:
         logger.error(f"event=multiagent_call_failed agent={agent_name} model={model} error_type=exception exception_class={e.__class__.__name__} trace_id={trace_id}")
         return (None, "exception")
@@ -604,11 +643,10 @@ async def _call_openrouter(
         "temperature": 0.7
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+    response = await get_http_client().post(url, headers=headers, json=payload)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
 
-        content = data["choices"][0]["message"]["content"]
-        logger.debug(f"OpenRouter response from {model}: {content[:100]}...")
-        return content
+    content = data["choices"][0]["message"]["content"]
+    logger.debug(f"OpenRouter response from {model}: {content[:100]}...")
+    return content
@@ -8,7 +8,41 @@ import pytest
 os.environ["PYTEST_RUNNING"] = "1"
 
 
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line("markers", "slow: deliberately slow tests (skip with -m 'not slow')")
+
+
 @pytest.fixture(scope="session")
 def anyio_backend():
     """Use asyncio backend for anyio tests."""
     return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI application shared by the whole test session."""
+    from quillo_agent.main import create_app
+
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """TestClient shared by the whole test session (lifespan runs once)."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def set_settings(monkeypatch):
+    """Override settings attributes for one test: set_settings(app_env="dev", ...)."""
+    from quillo_agent.config import settings
+
+    def _apply(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+
+    return _apply
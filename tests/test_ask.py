@@ -3,38 +3,29 @@ Tests for /ask Quillopreneur advice endpoint
 """
 import pytest
 from unittest.mock import patch
-from fastapi.testclient import TestClient
-from quillo_agent.main import create_app
 from quillo_agent.config import settings
 
-app = create_app()
-client = TestClient(app)
-
 # Test API key for authentication
 TEST_API_KEY = "dev-test-key-12345"
 
 
-def test_ask_without_auth():
-    """Test that /ask requires authentication"""
-    response = client.post(
-        "/ask",
-        json={"text": "How do I start a business?"}
-    )
-    # Should return 403 (Forbidden) or 401 (Unauthorized)
-    assert response.status_code in [401, 403]
-
-
-def test_ask_with_invalid_auth():
-    """Test that /ask rejects invalid API keys"""
+@pytest.mark.parametrize("headers,expected_statuses", [
+    # Missing credentials: 403 (Forbidden) or 401 (Unauthorized)
+    ({}, (401, 403)),
+    # Unknown API key
+    ({"Authorization": "Bearer invalid-key"}, (401,)),
+], ids=["without_auth", "invalid_auth"])
+def test_ask_rejects_unauthenticated(client, headers, expected_statuses):
+    """Test that /ask requires a valid API key"""
     response = client.post(
         "/ask",
-        headers={"Authorization": "Bearer invalid-key"},
+        headers=headers,
         json={"text": "How do I start a business?"}
     )
-    assert response.status_code == 401
+    assert response.status_code in expected_statuses
 
 
-def test_ask_offline_mode():
+def test_ask_offline_mode(client):
     """Test /ask returns offline response when no API keys configured"""
     with patch.object(settings, 'openrouter_api_key', ''):
         with patch.object(settings, 'anthropic_api_key', ''):
@@ -63,7 +54,7 @@ def test_ask_offline_mode():
             assert data["trace_id"].count("-") == 4
 
 
-def test_ask_with_user_id():
+def test_ask_with_user_id(client):
     """Test /ask with user_id parameter"""
     response = client.post(
         "/ask",
@@ -82,7 +73,7 @@ def test_ask_with_user_id():
     assert "trace_id" in data
 
 
-def test_ask_missing_text():
+def test_ask_missing_text(client):
     """Test /ask fails gracefully with missing text field"""
     response = client.post(
         "/ask",
@@ -94,7 +85,7 @@ def test_ask_missing_text():
     assert response.status_code == 422
 
 
-def test_ask_empty_text():
+def test_ask_empty_text(client):
     """Test /ask with empty text"""
     response = client.post(
         "/ask",
@@ -109,7 +100,7 @@ def test_ask_empty_text():
     assert "answer" in data
 
 
-def test_ask_long_text_truncation():
+def test_ask_long_text_truncation(client):
     """Test that very long text is handled safely"""
     long_text = "How do I start? " * 500  # Very long question
 
@@ -9,14 +9,9 @@ Test Coverage:
 - Integration tests
 """
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch, AsyncMock
-from quillo_agent.main import create_app
+from unittest.mock import patch
 from quillo_agent.config import settings
 
-app = create_app()
-client = TestClient(app)
-
 # Test constants
 TEST_UI_TOKEN = "dev-test-token-12345"
 
@@ -55,7 +50,7 @@ class TestEvidenceContract:
     """Test that Evidence API returns correct contract shape"""
 
     @patch('quillo_agent.routers.ui_proxy.retrieve_evidence')
-    def test_contract_shape_success(self, mock_retrieve):
+    def test_contract_shape_success(self, mock_retrieve, client):
         """Test that successful response has all required fields"""
         from quillo_agent.schemas import EvidenceResponse
         mock_retrieve.return_value = EvidenceResponse(**MOCK_EVIDENCE_SUCCESS)
@@ -86,7 +81,7 @@ class TestEvidenceContract:
         assert isinstance(data["sources"], list)
 
     @patch('quillo_agent.routers.ui_proxy.retrieve_evidence')
-    def test_contract_shape_error(self, mock_retrieve):
+    def test_contract_shape_error(self, mock_retrieve, client):
         """Test that error response has ok=False and error field"""
         from quillo_agent.schemas import EvidenceResponse
         mock_retrieve.return_value = EvidenceResponse(
@@ -113,7 +108,7 @@ class TestEvidenceContract:
         assert data["error"] is not None
         assert isinstance(data["error"], str)
 
-    def test_empty_query_rejected(self):
+    def test_empty_query_rejected(self, client):
         """Test that empty query returns error"""
         with patch.object(settings, 'quillo_ui_token', ''):
             response = client.post(
@@ -132,7 +127,7 @@ class TestEvidenceLimits:
     """Test that hard limits are enforced"""
 
     @patch('quillo_agent.routers.ui_proxy.retrieve_evidence')
-    def test_max_facts_limit(self, mock_retrieve):
+    def test_max_facts_limit(self, mock_retrieve, client):
         """Test that facts are limited to max 10"""
         # Create 15 facts (should be truncated to 10)
         many_facts = [
@@ -172,7 +167,7 @@ class TestEvidenceLimits:
         assert len(data["facts"]) <= 10, "Facts exceeded max limit of 10"
 
     @patch('quillo_agent.routers.ui_proxy.retrieve_evidence')
-    def test_max_sources_limit(self, mock_retrieve):
+    def test_max_sources_limit(self, mock_retrieve, client):
         """Test that sources are limited to max 8"""
         # Create 10 sources (should be truncated to 8)
         many_sources = [
@@ -221,7 +216,7 @@ class TestNoPersuasionLint:
     ]
 
     @patch('quillo_agent.routers.ui_proxy.retrieve_evidence')
-    def test_no_persuasion_in_facts(self, mock_retrieve):
+    def test_no_persuasion_in_facts(self, mock_retrieve, client):
         """Test that facts do not contain disallowed persuasion phrases"""
         # Create neutral facts (should pass)
         neutral_facts = [
@@ -304,7 +299,7 @@ class TestFailureModes:
     """Test error handling and failure scenarios"""
 
     @patch('quillo_agent.routers.ui_proxy.retrieve_evidence')
-    def test_network_failure_returns_neutral_error(self, mock_retrieve):
+    def test_network_failure_returns_neutral_error(self, mock_retrieve, client):
         """Test that network failures return neutral error with ok=False"""
         from quillo_agent.schemas import EvidenceResponse
         mock_retrieve.return_value = EvidenceResponse(
@@ -331,7 +326,7 @@ class TestFailureModes:
         assert len(data["facts"]) == 0
         assert len(data["sources"]) == 0
 
-    def test_missing_query_returns_error(self):
+    def test_missing_query_returns_error(self, client):
         """Test that missing query parameter returns error"""
         with patch.object(settings, 'quillo_ui_token', ''):
             response = client.post(
@@ -345,7 +340,7 @@ class TestFailureModes:
         assert data["ok"] is False
         assert "error" in data
 
-    def test_use_last_message_without_implementation(self):
+    def test_use_last_message_without_implementation(self, client):
         """Test that use_last_message returns appropriate error (not implemented in v1)"""
         with patch.object(settings, 'quillo_ui_token', ''):
             response = client.post(
@@ -357,13 +352,14 @@ class TestFailureModes:
         assert response.status_code == 200
         data = response.json()
         assert data["ok"] is False
-        assert "not yet implemented" in data["error"].lower() or "not implemented" in data["error"].lower()
+        error_lower = data["error"].lower()
+        assert "not yet implemented" in error_lower or "not implemented" in error_lower
 
 
 class TestRateLimiting:
     """Test that rate limiting is applied"""
 
-    def test_rate_limit_applied(self):
+    def test_rate_limit_applied(self, client):
         """Test that rate limiting is configured for evidence endpoint"""
         # The endpoint should have @limiter.limit("30/minute") decorator
         # This is a sanity check - actual rate limiting tested via integration
@@ -382,7 +378,7 @@ class TestRateLimiting:
 class TestEvidenceGuardsV1_1:
     """Test Evidence Guards v1.1 - empty_reason detection and authority guards"""
 
-    def test_empty_reason_field_exists(self):
+    def test_empty_reason_field_exists(self, client):
         """Test that empty_reason field is present in response when facts are empty"""
         with patch.object(settings, 'quillo_ui_token', ''):
             response = client.post(
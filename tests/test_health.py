@@ -2,13 +2,9 @@
 Test health check endpoint
 """
 import pytest
-from fastapi.testclient import TestClient
-from app import app
 
-client = TestClient(app)
 
-
-def test_health_check():
+def test_health_check(client):
     """Test GET /health returns 200 with status ok"""
     response = client.get("/health")
     assert response.status_code == 200
@@ -14,7 +14,7 @@ from quillo_agent.services.interaction_contract import (
     validate_no_leakage,
     ActionIntent,
     Stakes,
-    FORBIDDEN_PHRASES
+    FORBIDDEN_PHRASES_RE
 )
 
 
@@ -161,9 +161,8 @@ class TestNoChainOfThoughtLeakage:
             has_integrations={}
         )
 
-        message = result["assistant_message"].lower()
-        for phrase in FORBIDDEN_PHRASES:
-            assert phrase not in message, f"Forbidden phrase '{phrase}' found in: {result['assistant_message']}"
+        match = FORBIDDEN_PHRASES_RE.search(result["assistant_message"])
+        assert match is None, f"Forbidden phrase '{match.group(0)}' found in: {result['assistant_message']}"
 
     def test_medium_stakes_no_leakage(self):
         """Medium stakes responses should not leak internal reasoning."""
@@ -174,9 +173,8 @@ class TestNoChainOfThoughtLeakage:
             has_integrations={}
         )
 
-        message = result["assistant_message"].lower()
-        for phrase in FORBIDDEN_PHRASES:
-            assert phrase not in message, f"Forbidden phrase '{phrase}' found in: {result['assistant_message']}"
+        match = FORBIDDEN_PHRASES_RE.search(result["assistant_message"])
+        assert match is None, f"Forbidden phrase '{match.group(0)}' found in: {result['assistant_message']}"
 
     def test_high_stakes_no_leakage(self):
         """High stakes responses should not leak internal reasoning."""
@@ -187,9 +185,8 @@ class TestNoChainOfThoughtLeakage:
             has_integrations={}
         )
 
-        message = result["assistant_message"].lower()
-        for phrase in FORBIDDEN_PHRASES:
-            assert phrase not in message, f"Forbidden phrase '{phrase}' found in: {result['assistant_message']}"
+        match = FORBIDDEN_PHRASES_RE.search(result["assistant_message"])
+        assert match is None, f"Forbidden phrase '{match.group(0)}' found in: {result['assistant_message']}"
 
     def test_cannot_do_yet_no_leakage(self):
         """Cannot do yet responses should not leak internal reasoning."""
@@ -200,9 +197,8 @@ class TestNoChainOfThoughtLeakage:
             has_integrations={"email": False}
         )
 
-        message = result["assistant_message"].lower()
-        for phrase in FORBIDDEN_PHRASES:
-            assert phrase not in message, f"Forbidden phrase '{phrase}' found in: {result['assistant_message']}"
+        match = FORBIDDEN_PHRASES_RE.search(result["assistant_message"])
+        assert match is None, f"Forbidden phrase '{match.group(0)}' found in: {result['assistant_message']}"
 
     def test_validate_no_leakage_function(self):
         """Test the validate_no_leakage helper function."""
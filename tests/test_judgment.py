@@ -3,14 +3,23 @@ Tests for Judgment Explanation Layer
 
 Validates stake assessment, explanation generation, and response tone.
 """
+import re
 import pytest
-from fastapi.testclient import TestClient
 from quillo_agent.services.judgment import (
     assess_stakes,
     build_explanation,
     format_for_user
 )
-from quillo_agent.main import create_app
+
+
+# Technical/internal terms that shouldn't appear in user-facing explanations
+FORBIDDEN_TERMS_RE = re.compile(
+    "|".join(re.escape(term) for term in [
+        "classifier", "LLM", "model", "probability", "score",
+        "algorithm", "heuristic", "confidence", "token"
+    ]),
+    re.IGNORECASE
+)
 
 
 class TestStakeAssessment:
@@ -97,7 +106,8 @@ class TestExplanationBuilding:
             recommendation="draft a clear, professional response"
         )
         assert explanation["why_it_matters"] is not None, "Medium stakes should include 'why_it_matters'"
-        assert "professional" in explanation["why_it_matters"].lower() or "clear" in explanation["why_it_matters"].lower()
+        why_lower = explanation["why_it_matters"].lower()
+        assert "professional" in why_lower or "clear" in why_lower
 
     def test_high_stakes_includes_why_it_matters(self):
         """High stakes explanations should include 'why_it_matters'"""
@@ -149,20 +159,14 @@ class TestResponseTone:
             recommendation="draft a professional response"
         )
 
-        # Check for technical/internal terms that shouldn't appear
-        forbidden_terms = [
-            "classifier", "LLM", "model", "probability", "score",
-            "algorithm", "heuristic", "confidence", "token"
-        ]
-
         full_text = " ".join([
             explanation["what_i_see"],
             explanation.get("why_it_matters", ""),
             explanation["recommendation"]
-        ]).lower()
+        ])
 
-        for term in forbidden_terms:
-            assert term not in full_text, f"Should not expose internal term: {term}"
+        match = FORBIDDEN_TERMS_RE.search(full_text)
+        assert match is None, f"Should not expose internal term: {match.group(0)}"
 
     def test_conversational_observation(self):
         """'What I'm seeing' should be conversational"""
@@ -274,15 +278,11 @@ class TestRealWorldScenarios:
 class TestJudgmentEndpoint:
     """Integration tests for the /judgment endpoint"""
 
-    def setup_method(self):
-        """Set up test client"""
-        app = create_app()
-        self.client = TestClient(app)
-        self.test_api_key = "dev-test-key-12345"
+    test_api_key = "dev-test-key-12345"
 
-    def test_judgment_endpoint_high_stakes(self):
+    def test_judgment_endpoint_high_stakes(self, client):
         """Test /judgment endpoint with high stakes input"""
-        response = self.client.post(
+        response = client.post(
             "/judgment",
             json={
                 "text": "I need to fire a team member. This is urgent and I'm concerned about how to handle it.",
@@ -298,9 +298,9 @@ class TestJudgmentEndpoint:
         assert "what i'm seeing" in data["what_i_see"].lower()
         assert len(data["formatted_message"]) > 0
 
-    def test_judgment_endpoint_low_stakes(self):
+    def test_judgment_endpoint_low_stakes(self, client):
         """Test /judgment endpoint with low stakes input"""
-        response = self.client.post(
+        response = client.post(
             "/judgment",
             json={
                 "text": "Can you rewrite this paragraph for clarity?",
@@ -314,9 +314,9 @@ class TestJudgmentEndpoint:
         assert data["requires_confirmation"] is False
         assert data["why_it_matters"] is None
 
-    def test_judgment_endpoint_with_intent(self):
+    def test_judgment_endpoint_with_intent(self, client):
         """Test /judgment endpoint with intent provided"""
-        response = self.client.post(
+        response = client.post(
             "/judgment",
             json={
                 "text": "Help me respond to this angry client email",
@@ -8,22 +8,48 @@ Verifies:
 - No chain-of-thought leakage
 - Gemini as 4th peer agent
 """
+import asyncio
+import inspect
+import json
+import re
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
-from fastapi.testclient import TestClient
 import httpx
+import respx
 
-from quillo_agent.main import create_app
 from quillo_agent.config import settings
-from quillo_agent.services.multi_agent_chat import CLAUDE_MODEL, CHALLENGER_MODEL
+from quillo_agent.routers import ui_proxy
+from quillo_agent.services.multi_agent_chat import (
+    CHALLENGER_MODEL,
+    CLAUDE_MODEL,
+    GEMINI_MODEL,
+    _call_openrouter_safe,
+    stream_normal_mode_peers,
+)
 
 
 # Test UI token
 TEST_UI_TOKEN = "test-token-12345"
 
-# Create test client
-app = create_app()
-client = TestClient(app)
+# OpenRouter endpoint the multi-agent service posts to
+OPENROUTER_CHAT_URL = f"{settings.openrouter_base_url}/chat/completions"
+
+# Canonical UUID4 string: version nibble 4, RFC 4122 variant
+UUID4_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\Z")
+
+# Expected speaker order: Normal mode is peers only; Work mode frames and
+# synthesizes around them (Primary -> Claude -> DeepSeek -> Gemini -> Primary)
+PEER_AGENTS = ("claude", "deepseek", "gemini")
+WORK_MODE_AGENTS = ("quillo", *PEER_AGENTS, "quillo")
+
+# Peer agent behind each OpenRouter model id; any other model is the synthesis call
+MODEL_AGENTS = {CLAUDE_MODEL: "claude", CHALLENGER_MODEL: "deepseek", GEMINI_MODEL: "gemini"}
+
+# Pre-serialized request bodies for the common "Test question" prompt
+QUESTION_BODY = b'{"text": "Test question", "user_id": "test-user"}'
+WORK_QUESTION_BODY = b'{"text": "Test question", "user_id": "test-user", "mode": "work"}'
+AUTH_HEADERS = {"X-UI-Token": TEST_UI_TOKEN}
+JSON_HEADERS = {"Content-Type": "application/json"}
+AUTH_JSON_HEADERS = {**AUTH_HEADERS, **JSON_HEADERS}
 
 
 # Forbidden phrases that leak internal implementation
@@ -36,381 +62,361 @@ FORBIDDEN_PHRASES = [
     "system prompt",
     "here's my reasoning",
 ]
+FORBIDDEN_PHRASES_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in FORBIDDEN_PHRASES),
+    re.IGNORECASE
+)
+
+
+# Response contract: top-level fields and the fields every message carries
+RESPONSE_FIELDS = frozenset({"messages", "provider", "trace_id", "fallback_reason"})
+MESSAGE_FIELDS = frozenset({"role", "agent", "content", "model_id", "live", "unavailable_reason"})
+
+
+def assert_response_shape(data):
+    """Check a multi-agent reply carries every response and message field."""
+    missing = RESPONSE_FIELDS - data.keys()
+    assert not missing, f"response missing {sorted(missing)}"
+    assert isinstance(data["messages"], list)
+    assert len(data["messages"]) > 0
+    for i, msg in enumerate(data["messages"]):
+        missing = MESSAGE_FIELDS - msg.keys()
+        assert not missing, f"message {i} ({msg.get('agent')}) missing {sorted(missing)}"
+
+
+def completion_json(content):
+    """OpenRouter chat completion body carrying a single assistant message."""
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def pick_mock_reply(model, replies):
+    """Pick the canned reply for a model id: its peer agent, otherwise "synth"."""
+    return replies[MODEL_AGENTS.get(model, "synth")]
+
+
+def parse_sse(body):
+    """Split a multi-agent SSE body into (peer messages, done payload)."""
+    events = body.strip().split("\n\n")
+    messages = [json.loads(event.removeprefix("data: ")) for event in events[:-1]]
+    done_name, done_data = events[-1].split("\n")
+    assert done_name == "event: done"
+    return messages, json.loads(done_data.removeprefix("data: "))
+
+
+@pytest.fixture(scope="module")
+def offline_work_response(client):
+    """Offline Work-mode reply to the default question, fetched once per module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "quillo_ui_token", TEST_UI_TOKEN)
+        mp.setattr(settings, "openrouter_api_key", "")
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+    return response.status_code, response.json()
+
+
+# Realistic-length OpenRouter replies (not truncated) for the full-success path
+ONLINE_REPLIES = {
+    "claude": "Looking at your question, I'd consider the long-term implications first. The key is balancing immediate needs with sustainable outcomes. Whatever path you choose, documentation and clear communication will be critical. I'd recommend starting with a small proof-of-concept to validate the core assumptions before committing to a full implementation. This gives you flexibility to adjust based on early feedback.",
+    "deepseek": "Hold up—before you get too comfortable with that, ask yourself: what if the opposite is true? Sometimes the 'thoughtful' path is just procrastination with better PR. What's the risk of moving fast and adjusting later versus overthinking and missing the window? I'd argue that speed and iteration often beats perfect planning, especially when the market is moving quickly.",
+    "gemini": "Here's a structured view: break this into phases. First, validate your core assumption with user research. Second, test with a small pilot group to gather real feedback. Third, scale what works while maintaining quality. This approach gives you Claude's thoughtfulness without DeepSeek's risk of paralysis. Each phase should have clear success criteria and off-ramps.",
+    "synth": "All three perspectives add value here. My recommendation: use Gemini's phased approach as your framework, with Claude's long-term lens and DeepSeek's urgency check at each phase. The key is balancing speed with validation - move quickly through small experiments rather than slowly through big plans. Quick question: what's the smallest pilot you could run this week to test your core hypothesis?"
+}
+
+
+@pytest.fixture(scope="module")
+def online_work_response(client):
+    """Mocked online Work-mode reply where every OpenRouter call succeeds, fetched once per module.
+
+    Returns the status code, the parsed body and how many OpenRouter calls were made.
+    """
+    payloads = {agent: completion_json(text) for agent, text in ONLINE_REPLIES.items()}
+
+    def openrouter_reply(request):
+        """Answer a chat completion request based on the requested model"""
+        return httpx.Response(200, json=pick_mock_reply(json.loads(request.content)["model"], payloads))
+
+    with pytest.MonkeyPatch.context() as mp, respx.mock(assert_all_called=False) as router:
+        mp.setattr(settings, "quillo_ui_token", TEST_UI_TOKEN)
+        mp.setattr(settings, "openrouter_api_key", "test-key")
+        route = router.post(OPENROUTER_CHAT_URL).mock(side_effect=openrouter_reply)
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+    return response.status_code, response.json(), route.call_count
+
+
+@pytest.fixture
+async def async_client(app):
+    """In-process async client for tests that drive the async OpenRouter path."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
 
 
 class TestMultiAgentAuth:
     """Test authentication and authorization."""
 
-    def test_multi_agent_without_token_fails(self):
-        """Test that /ui/api/multi-agent requires UI token"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            response = client.post(
-                "/ui/api/multi-agent",
-                json={"text": "Test question", "user_id": "test-user"}
-            )
-            assert response.status_code in [401, 403]
-
-    def test_multi_agent_with_invalid_token_fails(self):
-        """Test that invalid UI token is rejected"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            response = client.post(
-                "/ui/api/multi-agent",
-                headers={"X-UI-Token": "wrong-token"},
-                json={"text": "Test question", "user_id": "test-user"}
-            )
-            assert response.status_code == 403
-
-    def test_multi_agent_with_valid_token_succeeds(self):
-        """Test that valid UI token allows access"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={"text": "Test question", "user_id": "test-user"}
-                )
-                assert response.status_code == 200
+    @pytest.mark.parametrize("headers,expected_status", [
+        # Missing token
+        (JSON_HEADERS, 401),
+        # Invalid token
+        ({"X-UI-Token": "wrong-token", **JSON_HEADERS}, 403),
+        # Valid token
+        (AUTH_JSON_HEADERS, 200),
+    ], ids=["without_token_fails", "with_invalid_token_fails", "with_valid_token_succeeds"])
+    def test_multi_agent_ui_token(self, client, set_settings, headers, expected_status):
+        """Test that /ui/api/multi-agent requires a valid UI token"""
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=headers,
+            content=QUESTION_BODY
+        )
+        assert response.status_code == expected_status
 
 
 class TestMultiAgentOfflineMode:
     """Test offline mode (no OpenRouter key)."""
 
-    def test_offline_returns_template_transcript(self):
+    def test_offline_returns_template_transcript(self, offline_work_response):
         """Test that offline mode returns template transcript (Work mode)"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "Can I get a second opinion on this micro-SaaS acquisition deal?",
-                        "user_id": "test-user",
-                        "mode": "work"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Check response structure
-                assert "messages" in data
-                assert "provider" in data
-                assert "trace_id" in data
-                assert "fallback_reason" in data
-
-                # Should use template provider with fallback reason
-                assert data["provider"] == "template"
-                assert data["fallback_reason"] == "openrouter_key_missing"
-
-                # Should have 5 messages (Primary/Claude/DeepSeek/Gemini/Primary)
-                assert len(data["messages"]) == 5
-
-                # Check message structure
-                for msg in data["messages"]:
-                    assert "role" in msg
-                    assert "agent" in msg
-                    assert "content" in msg
-                    assert msg["role"] == "assistant"
-
-                # Check agents
-                agents = [msg["agent"] for msg in data["messages"]]
-                assert agents == ["quillo", "claude", "deepseek", "gemini", "quillo"]
-
-                # Check content is not empty
-                for msg in data["messages"]:
-                    assert len(msg["content"]) > 10
-
-    def test_offline_no_chain_of_thought_leakage(self):
-        """Test that offline responses don't leak internal reasoning (Work mode)"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Check all messages for forbidden phrases
-                for msg in data["messages"]:
-                    content_lower = msg["content"].lower()
-                    for phrase in FORBIDDEN_PHRASES:
-                        assert phrase not in content_lower, \
-                            f"Forbidden phrase '{phrase}' found in: {msg['content']}"
+        status_code, data = offline_work_response
+        assert status_code == 200
+
+        # Check response structure
+        assert_response_shape(data)
+
+        # Should use template provider with fallback reason
+        assert data["provider"] == "template"
+        assert data["fallback_reason"] == "openrouter_key_missing"
 
+        # Should have 5 messages (Primary/Claude/DeepSeek/Gemini/Primary)
+        assert len(data["messages"]) == 5
 
+        # Pull the message fields out in one pass (a missing field fails here)
+        roles, agents, contents = zip(*(
+            (msg["role"], msg["agent"], msg["content"]) for msg in data["messages"]
+        ))
+
+        # Check message structure
+        assert set(roles) == {"assistant"}
+
+        # Check agents
+        assert agents == WORK_MODE_AGENTS
+
+        # Check content is not empty
+        assert all(len(content) > 10 for content in contents), contents
+
+    def test_offline_no_chain_of_thought_leakage(self, offline_work_response):
+        """Test that offline responses don't leak internal reasoning (Work mode)"""
+        status_code, data = offline_work_response
+        assert status_code == 200
+
+        # Check all messages for forbidden phrases in one pass
+        # (NUL separator keeps a phrase from matching across two messages)
+        contents = [msg["content"] for msg in data["messages"]]
+        match = FORBIDDEN_PHRASES_RE.search("\n\x00\n".join(contents))
+        if match:
+            leaked = next(c for c in contents if FORBIDDEN_PHRASES_RE.search(c))
+            pytest.fail(f"Forbidden phrase '{match.group(0)}' found in: {leaked}")
+
+    def test_offline_skips_evidence_fetch(self, client, set_settings, monkeypatch):
+        """Test that offline Work mode doesn't fetch evidence the template transcript can't use
+
+        Offline contract: no evidence is fetched, so no message carries the
+        "Evidence: on" disclosure even for prompts that would trigger it online.
+        """
+        evidence_queries = []
+
+        async def fake_retrieve_evidence(query):
+            evidence_queries.append(query)
+
+        monkeypatch.setattr(ui_proxy, "classify_prompt_needs_evidence", lambda text: True)
+        monkeypatch.setattr(ui_proxy, "retrieve_evidence", fake_retrieve_evidence)
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["provider"] == "template"
+        assert evidence_queries == []
+        for msg in data["messages"]:
+            assert "Evidence: on" not in msg["content"]
+
+
+@pytest.mark.anyio
 class TestMultiAgentOnlineMode:
-    """Test online mode with OpenRouter."""
+    """Test online mode with OpenRouter (mocked at the transport layer by respx)."""
 
-    def test_online_with_openrouter_mock(self):
+    def test_online_with_openrouter_mock(self, online_work_response):
         """Test that online mode calls OpenRouter correctly"""
-        from unittest.mock import MagicMock
-
-        # Mock OpenRouter responses
-        mock_responses = {
-            "claude": "Claude's perspective on this matter.",
-            "deepseek": "DeepSeek's contrasting view here.",
-            "gemini": "Gemini's structured analysis here.",
-            "synth": "Here's my synthesis and recommendation. What's your risk tolerance?"
-        }
-
-        def create_mock_response(model):
-            """Create a mock response for a given model"""
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-
-            if "claude" in model.lower():
-                content = mock_responses["claude"]
-            elif "deepseek" in model.lower():
-                content = mock_responses["deepseek"]
-            elif "gemini" in model.lower():
-                content = mock_responses["gemini"]
-            else:
-                content = mock_responses["synth"]
-
-            mock_resp.json.return_value = {
-                "choices": [{"message": {"content": content}}]
-            }
-            return mock_resp
-
-        # Track which model is being called
-        call_count = [0]
-
-        async def mock_post(url, *args, **kwargs):
-            """Mock httpx.AsyncClient.post"""
-            payload = kwargs.get("json", {})
-            model = payload.get("model", "")
-            call_count[0] += 1
-            return create_mock_response(model)
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', 'test-key'):
-                with patch('httpx.AsyncClient.post', new=mock_post):
-                    response = client.post(
-                        "/ui/api/multi-agent",
-                        headers={"X-UI-Token": TEST_UI_TOKEN},
-                        json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                    )
-                    assert response.status_code == 200
-                    data = response.json()
-
-                    # Should use openrouter provider with no fallback reason
-                    assert data["provider"] == "openrouter"
-                    assert data["fallback_reason"] is None
-
-                    # Should have 5 messages (Work mode)
-                    assert len(data["messages"]) == 5
-
-                    # Check agents (Work mode)
-                    agents = [msg["agent"] for msg in data["messages"]]
-                    assert agents == ["quillo", "claude", "deepseek", "gemini", "quillo"]
-
-    def test_online_all_peers_fail_partial_live(self):
+        status_code, data, openrouter_calls = online_work_response
+        assert status_code == 200
+
+        # Should use openrouter provider with no fallback reason
+        assert data["provider"] == "openrouter"
+        assert data["fallback_reason"] is None
+
+        # Should have 5 messages (Work mode)
+        assert len(data["messages"]) == 5
+
+        # Check agents (Work mode)
+        agents = tuple(msg["agent"] for msg in data["messages"])
+        assert agents == WORK_MODE_AGENTS
+
+        # Three peers plus the synthesis went out over HTTP
+        assert openrouter_calls == 4
+
+    async def test_online_all_peers_fail_partial_live(self, async_client, set_settings, respx_mock):
         """Test that when all peer agents fail, we get partial-live with peers_unavailable=True (Work mode)"""
-        async def mock_post_error(*args, **kwargs):
-            """Mock httpx.AsyncClient.post that raises error for all OpenRouter calls"""
-            raise httpx.HTTPError("API error")
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', 'test-key'):
-                with patch('httpx.AsyncClient.post', new=mock_post_error):
-                    response = client.post(
-                        "/ui/api/multi-agent",
-                        headers={"X-UI-Token": TEST_UI_TOKEN},
-                        json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                    )
-                    assert response.status_code == 200
-                    data = response.json()
-
-                    # NEW BEHAVIOR: Partial-live instead of full template fallback
-                    # Quillo frame succeeds (deterministic), all peers fail
-                    assert data["provider"] == "openrouter"
-                    assert data["peers_unavailable"] == True
-                    assert data["fallback_reason"] is None
-                    assert len(data["messages"]) == 5
-
-                    # All peer agents should be unavailable
-                    for msg in data["messages"]:
-                        if msg["agent"] in ["claude", "deepseek", "gemini"]:
-                            assert msg["live"] == False
-                            assert msg["unavailable_reason"] == "exception"  # HTTPError is caught by generic Exception handler
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(side_effect=httpx.HTTPError("API error"))
+
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='test-key')
+        response = await async_client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # NEW BEHAVIOR: Partial-live instead of full template fallback
+        # Quillo frame succeeds (deterministic), all peers fail
+        assert data["provider"] == "openrouter"
+        assert data["peers_unavailable"] == True
+        assert data["fallback_reason"] is None
+        assert len(data["messages"]) == 5
+
+        # All peer agents should be unavailable
+        for msg in data["messages"]:
+            if msg["agent"] in PEER_AGENTS:
+                assert msg["live"] == False
+                assert msg["unavailable_reason"] == "exception"  # HTTPError is caught by generic Exception handler
+
+    async def test_peer_calls_run_concurrently(self, async_client, set_settings, respx_mock):
+        """Test that the three peer calls are in flight at the same time (Normal mode)"""
+        in_flight = 0
+        peak_in_flight = 0
+
+        async def openrouter_reply(request):
+            nonlocal in_flight, peak_in_flight
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=completion_json("Peer perspective."))
+
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(side_effect=openrouter_reply)
+
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='test-key')
+        response = await async_client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=QUESTION_BODY
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # Transcript order is unchanged by the concurrent calls
+        assert tuple(msg["agent"] for msg in data["messages"]) == PEER_AGENTS
+        assert peak_in_flight == len(PEER_AGENTS)
 
 
 class TestMultiAgentResponseStructure:
     """Test response structure and content quality."""
 
-    def test_response_has_all_required_fields(self):
+    def test_response_has_all_required_fields(self, offline_work_response):
         """Test that response has all required fields (Work mode)"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Required top-level fields
-                assert "messages" in data
-                assert "provider" in data
-                assert "trace_id" in data
-                assert "fallback_reason" in data
-
-                # Messages structure
-                assert isinstance(data["messages"], list)
-                assert len(data["messages"]) > 0
-
-                # Each message has required fields
-                for msg in data["messages"]:
-                    assert "role" in msg
-                    assert "agent" in msg
-                    assert "content" in msg
-
-    def test_trace_id_is_uuid(self):
+        status_code, data = offline_work_response
+        assert status_code == 200
+
+        # Required top-level fields and per-message fields
+        assert_response_shape(data)
+
+    def test_trace_id_is_uuid(self, offline_work_response):
         """Test that trace_id is a valid UUID"""
-        import uuid
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Should be a valid UUID
-                try:
-                    uuid.UUID(data["trace_id"])
-                except ValueError:
-                    pytest.fail("trace_id is not a valid UUID")
+        status_code, data = offline_work_response
+        assert status_code == 200
 
-    def test_messages_in_correct_order(self):
+        # Should be a canonical lowercase UUID4 (str(uuid.uuid4()))
+        assert UUID4_RE.match(data["trace_id"]), "trace_id is not a valid UUID"
+
+    def test_messages_in_correct_order(self, offline_work_response):
         """Test that messages are in correct order (Work mode)"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Should be: Primary -> Claude -> DeepSeek -> Gemini -> Primary
-                agents = [msg["agent"] for msg in data["messages"]]
-                assert agents[0] == "quillo"  # Primary frames
-                assert agents[1] == "claude"  # Claude perspective
-                assert agents[2] == "deepseek"    # DeepSeek contrasts
-                assert agents[3] == "gemini"  # Gemini structured analysis
-                assert agents[4] == "quillo"  # Primary synthesizes
-
-    def test_optional_agents_parameter(self):
+        status_code, data = offline_work_response
+        assert status_code == 200
+
+        agents = tuple(msg["agent"] for msg in data["messages"])
+        assert agents == WORK_MODE_AGENTS
+
+    def test_optional_agents_parameter(self, client, set_settings):
         """Test that agents parameter is optional (Work mode)"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                # Without agents parameter, with explicit Work mode
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={"text": "Test question", "mode": "work"}
-                )
-                assert response.status_code == 200
-                data = response.json()
-                assert len(data["messages"]) == 5
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={"text": "Test question", "user_id": "test-user", "mode": "work"}
+        )
+        assert response.status_code == 200
+
+        # No agents requested: the default Work-mode lineup answers
+        agents = tuple(msg["agent"] for msg in response.json()["messages"])
+        assert agents == WORK_MODE_AGENTS
 
 
 class TestMultiAgentDevBypass:
     """Test dev mode bypass behavior."""
 
-    def test_dev_mode_no_token_configured_bypasses(self):
+    def test_dev_mode_no_token_configured_bypasses(self, client, set_settings):
         """Test that dev mode with no token configured bypasses auth (Work mode)"""
-        with patch.object(settings, 'app_env', 'dev'):
-            with patch.object(settings, 'quillo_ui_token', ''):
-                with patch.object(settings, 'openrouter_api_key', ''):
-                    response = client.post(
-                        "/ui/api/multi-agent",
-                        json={"text": "Test question", "user_id": "test-user", "mode": "work"}
-                    )
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["provider"] == "template"
+        set_settings(app_env='dev', quillo_ui_token='', openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["provider"] == "template"
 
 
 class TestMultiAgentTruncation:
     """Test that responses are not truncated mid-sentence."""
 
-    def test_responses_not_truncated_min_length(self):
+    def test_responses_not_truncated_min_length(self, online_work_response):
         """Test that live agent responses meet minimum length expectations"""
-        def create_mock_response(model, content):
-            """Create a mock response"""
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-            mock_resp.json.return_value = {
-                "choices": [{"message": {"content": content}}]
-            }
-            return mock_resp
-
-        # Create realistic-length responses (not truncated)
-        mock_responses = {
-            "claude": "Looking at your question, I'd consider the long-term implications first. The key is balancing immediate needs with sustainable outcomes. Whatever path you choose, documentation and clear communication will be critical. I'd recommend starting with a small proof-of-concept to validate the core assumptions before committing to a full implementation. This gives you flexibility to adjust based on early feedback.",
-            "deepseek": "Hold up—before you get too comfortable with that, ask yourself: what if the opposite is true? Sometimes the 'thoughtful' path is just procrastination with better PR. What's the risk of moving fast and adjusting later versus overthinking and missing the window? I'd argue that speed and iteration often beats perfect planning, especially when the market is moving quickly.",
-            "gemini": "Here's a structured view: break this into phases. First, validate your core assumption with user research. Second, test with a small pilot group to gather real feedback. Third, scale what works while maintaining quality. This approach gives you Claude's thoughtfulness without DeepSeek's risk of paralysis. Each phase should have clear success criteria and off-ramps.",
-            "synth": "All three perspectives add value here. My recommendation: use Gemini's phased approach as your framework, with Claude's long-term lens and DeepSeek's urgency check at each phase. The key is balancing speed with validation - move quickly through small experiments rather than slowly through big plans. Quick question: what's the smallest pilot you could run this week to test your core hypothesis?"
-        }
-
-        async def mock_post(url, *args, **kwargs):
-            """Mock httpx.AsyncClient.post"""
-            model = kwargs.get("json", {}).get("model", "")
-
-            if "claude" in model.lower():
-                content = mock_responses["claude"]
-            elif "deepseek" in model.lower():
-                content = mock_responses["deepseek"]
-            elif "gemini" in model.lower():
-                content = mock_responses["gemini"]
-            else:
-                content = mock_responses["synth"]
-
-            return create_mock_response(model, content)
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', 'test-key'):
-                with patch('httpx.AsyncClient.post', new=mock_post):
-                    response = client.post(
-                        "/ui/api/multi-agent",
-                        headers={"X-UI-Token": TEST_UI_TOKEN},
-                        json={"text": "Should I build a custom CRM or use an off-the-shelf solution?", "user_id": "test-user", "mode": "work"}
-                    )
-                    assert response.status_code == 200
-                    data = response.json()
-
-                    # Verify all live peer responses are substantive (not truncated)
-                    for i, msg in enumerate(data["messages"]):
-                        if msg["agent"] in ["claude", "deepseek", "gemini"] and msg.get("live", True):
-                            # Peer agent responses should be at least 100 chars to be substantive
-                            assert len(msg["content"]) >= 100, \
-                                f"{msg['agent']} response too short ({len(msg['content'])} chars): {msg['content']}"
-
-                            # Should end with proper punctuation (not truncated mid-sentence)
-                            assert msg["content"].rstrip()[-1] in ['.', '!', '?'], \
-                                f"{msg['agent']} response doesn't end with punctuation: {msg['content'][-50:]}"
-
-                        # First quillo message is just a frame, skip it
-                        # Last quillo message (synthesis) should also be substantive
-                        if msg["agent"] == "quillo" and i > 0 and msg.get("live", True):
-                            assert len(msg["content"]) >= 100, \
-                                f"quillo synthesis response too short ({len(msg['content'])} chars): {msg['content']}"
-                            assert msg["content"].rstrip()[-1] in ['.', '!', '?'], \
-                                f"quillo synthesis response doesn't end with punctuation: {msg['content'][-50:]}"
+        status_code, data, _ = online_work_response
+        assert status_code == 200
+
+        # Verify all live peer responses are substantive (not truncated)
+        for i, msg in enumerate(data["messages"]):
+            if msg["agent"] in PEER_AGENTS and msg.get("live", True):
+                # Peer agent responses should be at least 100 chars to be substantive
+                assert len(msg["content"]) >= 100, \
+                    f"{msg['agent']} response too short ({len(msg['content'])} chars): {msg['content']}"
+
+                # Should end with proper punctuation (not truncated mid-sentence)
+                assert msg["content"].rstrip()[-1] in ['.', '!', '?'], \
+                    f"{msg['agent']} response doesn't end with punctuation: {msg['content'][-50:]}"
+
+            # First quillo message is just a frame, skip it
+            # Last quillo message (synthesis) should also be substantive
+            if msg["agent"] == "quillo" and i > 0 and msg.get("live", True):
+                assert len(msg["content"]) >= 100, \
+                    f"quillo synthesis response too short ({len(msg['content'])} chars): {msg['content']}"
+                assert msg["content"].rstrip()[-1] in ['.', '!', '?'], \
+                    f"quillo synthesis response doesn't end with punctuation: {msg['content'][-50:]}"
 
     def test_max_tokens_increased_from_300(self):
         """Test that max_tokens default has been increased from 300 to prevent truncation"""
-        from quillo_agent.services.multi_agent_chat import _call_openrouter_safe
-        import inspect
-
         # Get the default value of max_tokens parameter
         sig = inspect.signature(_call_openrouter_safe)
         max_tokens_default = sig.parameters['max_tokens'].default
@@ -420,141 +426,116 @@ class TestMultiAgentTruncation:
             f"max_tokens default is {max_tokens_default}, should be >= 1000 to prevent truncation"
 
 
+@pytest.mark.anyio
 class TestMultiAgentPartialLive:
     """Test partial-live behavior where individual agents can fail independently."""
 
-    def test_quillo_succeeds_all_peers_fail(self):
+    @pytest.mark.parametrize("status_code, expected_reason", [
+        (429, "rate_limited"),
+        (404, "not_found"),
+        (500, "http_error"),
+    ])
+    async def test_http_status_reason_buckets(self, set_settings, respx_mock, status_code, expected_reason):
+        """Test that HTTP error statuses map to their unavailable_reason bucket"""
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(return_value=httpx.Response(status_code))
+
+        set_settings(openrouter_api_key='test-key')
+        content, reason = await _call_openrouter_safe(CLAUDE_MODEL, "system", "Test question", agent_name="claude")
+        assert content is None
+        assert reason == expected_reason
+
+    async def test_quillo_succeeds_all_peers_fail(self, async_client, set_settings, respx_mock):
         """Test Quillo succeeds but all peers fail → openrouter with peers_unavailable=True (Work mode)"""
-        call_count = [0]
-
-        def create_mock_response(model, content):
-            """Create a mock response"""
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-            mock_resp.json.return_value = {
-                "choices": [{"message": {"content": content}}]
-            }
-            return mock_resp
-
-        async def mock_post(url, *args, **kwargs):
-            call_count[0] += 1
-            model = kwargs.get("json", {}).get("model", "")
+        synthesis = completion_json("Synthesis content")
 
+        def openrouter_reply(request):
             # All peer calls fail
-            if "claude" in model.lower() or "deepseek" in model.lower() or "gemini" in model.lower():
+            if json.loads(request.content)["model"] in MODEL_AGENTS:
                 raise httpx.TimeoutException("Timeout")
 
             # Synthesis succeeds
-            return create_mock_response(model, "Synthesis content")
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', 'test-key'):
-                with patch('httpx.AsyncClient.post', new=mock_post):
-                    response = client.post("/ui/api/multi-agent",
-                                           headers={"X-UI-Token": TEST_UI_TOKEN},
-                                           json={"text": "test", "user_id": "demo", "mode": "work"})
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["provider"] == "openrouter"
-                    assert data["peers_unavailable"] == True
-
-                    # Check peer agents are unavailable
-                    claude_msg = next(m for m in data["messages"] if m["agent"] == "claude")
-                    assert claude_msg["live"] == False
-                    assert claude_msg["unavailable_reason"] == "timeout"
-                    assert "[Agent unavailable:" in claude_msg["content"]
-
-    def test_quillo_and_one_peer_succeed(self):
+            return httpx.Response(200, json=synthesis)
+
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(side_effect=openrouter_reply)
+
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='test-key')
+        response = await async_client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["provider"] == "openrouter"
+        assert data["peers_unavailable"] == True
+
+        # Check peer agents are unavailable
+        peers = {m["agent"]: m for m in data["messages"] if m["agent"] in PEER_AGENTS}
+        claude_msg = peers["claude"]
+        assert claude_msg["live"] == False
+        assert claude_msg["unavailable_reason"] == "timeout"
+        assert "[Agent unavailable:" in claude_msg["content"]
+
+    async def test_quillo_and_one_peer_succeed(self, async_client, set_settings, respx_mock):
         """Test Quillo + Claude succeed, DeepSeek/Gemini fail → openrouter, peers_unavailable=False (Work mode)"""
-        call_count = [0]
-
-        def create_mock_response(model, content):
-            """Create a mock response"""
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-            mock_resp.json.return_value = {
-                "choices": [{"message": {"content": content}}]
-            }
-            return mock_resp
+        claude_reply = completion_json("Claude response")
+        synthesis = completion_json("Synthesis")
 
-        async def mock_post(url, *args, **kwargs):
-            call_count[0] += 1
-            model = kwargs.get("json", {}).get("model", "")
+        def openrouter_reply(request):
+            agent = MODEL_AGENTS.get(json.loads(request.content)["model"])
 
             # Claude succeeds
-            if "claude" in model.lower():
-                return create_mock_response(model, "Claude response")
+            if agent == "claude":
+                return httpx.Response(200, json=claude_reply)
 
-            # DeepSeek and Gemini fail
-            if "deepseek" in model.lower() or "gemini" in model.lower():
-                mock_resp = MagicMock()
-                mock_resp.status_code = 429
-                raise httpx.HTTPStatusError("Rate limited",
-                                           request=MagicMock(),
-                                           response=mock_resp)
+            # DeepSeek and Gemini fail (raise_for_status turns the 429 into HTTPStatusError)
+            if agent in ("deepseek", "gemini"):
+                return httpx.Response(429)
 
             # Synthesis succeeds
-            return create_mock_response(model, "Synthesis")
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', 'test-key'):
-                with patch('httpx.AsyncClient.post', new=mock_post):
-                    response = client.post("/ui/api/multi-agent",
-                                           headers={"X-UI-Token": TEST_UI_TOKEN},
-                                           json={"text": "test", "user_id": "demo", "mode": "work"})
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["provider"] == "openrouter"
-                    assert data["peers_unavailable"] == False
-
-                    # Check Claude is live
-                    claude_msg = next(m for m in data["messages"] if m["agent"] == "claude")
-                    assert claude_msg["live"] == True
-                    assert claude_msg["model_id"] == CLAUDE_MODEL
-
-                    # Check DeepSeek is unavailable
-                    deepseek_msg = next(m for m in data["messages"] if m["agent"] == "deepseek")
-                    assert deepseek_msg["live"] == False
-                    assert deepseek_msg["unavailable_reason"] == "rate_limited"
-
-    def test_all_messages_have_new_metadata_fields(self):
+            return httpx.Response(200, json=synthesis)
+
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(side_effect=openrouter_reply)
+
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='test-key')
+        response = await async_client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["provider"] == "openrouter"
+        assert data["peers_unavailable"] == False
+
+        peers = {m["agent"]: m for m in data["messages"] if m["agent"] in PEER_AGENTS}
+
+        # Check Claude is live
+        claude_msg = peers["claude"]
+        assert claude_msg["live"] == True
+        assert claude_msg["model_id"] == CLAUDE_MODEL
+
+        # Check DeepSeek is unavailable
+        deepseek_msg = peers["deepseek"]
+        assert deepseek_msg["live"] == False
+        assert deepseek_msg["unavailable_reason"] == "rate_limited"
+
+    def test_all_messages_have_new_metadata_fields(self, online_work_response):
         """Test that all messages have model_id, live, unavailable_reason fields (Work mode)"""
+        status_code, data, _ = online_work_response
+        assert status_code == 200
 
-        def create_mock_response(model, content):
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-            mock_resp.json.return_value = {
-                "choices": [{"message": {"content": content}}]
-            }
-            return mock_resp
-
-        async def mock_post(url, *args, **kwargs):
-            model = kwargs.get("json", {}).get("model", "")
-            return create_mock_response(model, f"Response from {model}")
-
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', 'test-key'):
-                with patch('httpx.AsyncClient.post', new=mock_post):
-                    response = client.post("/ui/api/multi-agent",
-                                           headers={"X-UI-Token": TEST_UI_TOKEN},
-                                           json={"text": "test", "user_id": "demo", "mode": "work"})
-
-                    assert response.status_code == 200
-                    data = response.json()
-
-                    # All messages should have the new fields
-                    for msg in data["messages"]:
-                        assert "model_id" in msg
-                        assert "live" in msg
-                        assert "unavailable_reason" in msg
-                        # First message (quillo frame) should have model_id=None
-                        if msg["agent"] == "quillo" and data["messages"].index(msg) == 0:
-                            assert msg["model_id"] is None
-                        # Live messages should have unavailable_reason=None
-                        if msg["live"]:
-                            assert msg["unavailable_reason"] is None
+        # All messages should have the new fields
+        assert_response_shape(data)
+        for i, msg in enumerate(data["messages"]):
+            # First message (quillo frame) should have model_id=None
+            if msg["agent"] == "quillo" and i == 0:
+                assert msg["model_id"] is None
+            # Live messages should have unavailable_reason=None
+            if msg["live"]:
+                assert msg["unavailable_reason"] is None
 
 
 class TestNormalModeParity:
@@ -575,157 +556,291 @@ class TestNormalModeParity:
         "Alternatives",
         "Execution Tool",
     ]
+    WORK_SCAFFOLDING_RE = re.compile("|".join(map(re.escape, WORK_SCAFFOLDING_MARKERS)))
 
-    def test_normal_mode_returns_peers_only(self):
+    def test_normal_mode_returns_peers_only(self, client, set_settings):
         """Test that Normal mode returns only peer messages (no intro, no synthesis)"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "What's a good price for a micro-SaaS?",
-                        "user_id": "test-user",
-                        "mode": "normal"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Normal mode: 3 messages (Claude, DeepSeek, Gemini) - NO quillo
-                assert len(data["messages"]) == 3
-
-                # Check agents - should be peers only
-                agents = [msg["agent"] for msg in data["messages"]]
-                assert "quillo" not in agents, "Normal mode should not include Uorin/quillo messages"
-                assert agents == ["claude", "deepseek", "gemini"]
-
-    def test_normal_mode_no_work_scaffolding_markers(self):
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "What's a good price for a micro-SaaS?",
+                "user_id": "test-user",
+                "mode": "normal"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # Normal mode: 3 messages (Claude, DeepSeek, Gemini) - NO quillo
+        assert len(data["messages"]) == 3
+
+        # Check agents - should be peers only
+        agents = tuple(msg["agent"] for msg in data["messages"])
+        assert "quillo" not in agents, "Normal mode should not include Uorin/quillo messages"
+        assert agents == PEER_AGENTS
+
+    def test_normal_mode_no_work_scaffolding_markers(self, client, set_settings):
         """Test that Normal mode responses don't contain work scaffolding markers"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "Should I invest in Bitcoin?",
-                        "user_id": "test-user",
-                        "mode": "normal"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Check all messages for work scaffolding markers
-                for msg in data["messages"]:
-                    content = msg["content"]
-                    for marker in self.WORK_SCAFFOLDING_MARKERS:
-                        assert marker not in content, \
-                            f"Work scaffolding marker '{marker}' found in Normal mode response: {content[:100]}..."
-
-    def test_work_mode_returns_full_structure(self):
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "Should I invest in Bitcoin?",
+                "user_id": "test-user",
+                "mode": "normal"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # Check all messages for work scaffolding markers
+        for msg in data["messages"]:
+            content = msg["content"]
+            match = self.WORK_SCAFFOLDING_RE.search(content)
+            assert match is None, \
+                f"Work scaffolding marker '{match.group(0)}' found in Normal mode response: {content[:100]}..."
+
+    def test_work_mode_returns_full_structure(self, client, set_settings):
         """Test that Work mode still returns intro + peers + synthesis"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                # Use a longer prompt to avoid triggering no-assumptions check
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "I'm considering whether to use React or Vue for my new e-commerce project. I need something that scales well and has good ecosystem support. My team is experienced in JavaScript but not specifically in either framework. We expect around 10,000 daily users initially.",
-                        "user_id": "test-user",
-                        "mode": "work"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Work mode: 5 messages (quillo intro, claude, deepseek, gemini, quillo synthesis)
-                assert len(data["messages"]) == 5
-
-                # Check agents order
-                agents = [msg["agent"] for msg in data["messages"]]
-                assert agents == ["quillo", "claude", "deepseek", "gemini", "quillo"]
-
-                # First message should be Quillo intro
-                assert "perspectives" in data["messages"][0]["content"].lower()
-
-                # Last message should be Quillo synthesis
-                assert data["messages"][-1]["agent"] == "quillo"
-
-    def test_mode_defaults_to_normal(self):
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        # Use a longer prompt to avoid triggering no-assumptions check
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "I'm considering whether to use React or Vue for my new e-commerce project. I need something that scales well and has good ecosystem support. My team is experienced in JavaScript but not specifically in either framework. We expect around 10,000 daily users initially.",
+                "user_id": "test-user",
+                "mode": "work"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # Work mode: 5 messages (quillo intro, claude, deepseek, gemini, quillo synthesis)
+        assert len(data["messages"]) == 5
+
+        # Check agents order
+        agents = tuple(msg["agent"] for msg in data["messages"])
+        assert agents == WORK_MODE_AGENTS
+
+        # First message should be Quillo intro
+        assert "perspectives" in data["messages"][0]["content"].lower()
+
+        # Last message should be Quillo synthesis
+        assert data["messages"][-1]["agent"] == "quillo"
+
+    def test_mode_defaults_to_normal(self, client, set_settings):
         """Test that mode defaults to 'normal' when not specified"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "Test question",
-                        "user_id": "test-user"
-                        # mode not specified - should default to normal
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Should behave like Normal mode: 3 peer messages only
-                assert len(data["messages"]) == 3
-                agents = [msg["agent"] for msg in data["messages"]]
-                assert "quillo" not in agents
-
-    def test_mode_case_insensitive(self):
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_JSON_HEADERS,
+            # mode not specified - should default to normal
+            content=QUESTION_BODY
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # Should behave like Normal mode: 3 peer messages only
+        assert len(data["messages"]) == 3
+        agents = tuple(msg["agent"] for msg in data["messages"])
+        assert "quillo" not in agents
+
+    def test_mode_case_insensitive(self, client, set_settings):
         """Test that mode is case-insensitive"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                # Test WORK (uppercase)
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "Test question",
-                        "user_id": "test-user",
-                        "mode": "WORK"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-                assert len(data["messages"]) == 5  # Work mode structure
-
-                # Test Normal (mixed case)
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "Test question",
-                        "user_id": "test-user",
-                        "mode": "Normal"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-                assert len(data["messages"]) == 3  # Normal mode structure
-
-    def test_normal_mode_skips_trust_contract_checks(self):
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        # Test WORK (uppercase)
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "Test question",
+                "user_id": "test-user",
+                "mode": "WORK"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["messages"]) == 5  # Work mode structure
+
+        # Test Normal (mixed case)
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "Test question",
+                "user_id": "test-user",
+                "mode": "Normal"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["messages"]) == 3  # Normal mode structure
+
+    @pytest.mark.parametrize("mode, expected", [
+        ("work", "work"),
+        (" Work ", "work"),
+        ("normal", "normal"),
+        (None, "normal"),
+        ("", "normal"),
+        ("unknown", "normal"),
+    ])
+    def test_resolve_mode(self, mode, expected):
+        """Test that unknown or missing modes fall back to Normal mode"""
+        assert ui_proxy._resolve_mode(mode) == expected
+
+    def test_normal_mode_skips_trust_contract_checks(self, client, set_settings):
         """Test that Normal mode skips no-assumptions and evidence auto-fetch"""
-        with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
-            with patch.object(settings, 'openrouter_api_key', ''):
-                # This prompt would trigger no-assumptions in Work mode (short, vague)
-                response = client.post(
-                    "/ui/api/multi-agent",
-                    headers={"X-UI-Token": TEST_UI_TOKEN},
-                    json={
-                        "text": "Help",
-                        "user_id": "test-user",
-                        "mode": "normal"
-                    }
-                )
-                assert response.status_code == 200
-                data = response.json()
-
-                # Should NOT return a "I need details" clarifying question
-                # Should return peer messages directly
-                assert len(data["messages"]) == 3
-                for msg in data["messages"]:
-                    assert "I need a few details" not in msg["content"]
-                    assert "no guessing" not in msg["content"]
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        # This prompt would trigger no-assumptions in Work mode (short, vague)
+        response = client.post(
+            "/ui/api/multi-agent",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "Help",
+                "user_id": "test-user",
+                "mode": "normal"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # Should NOT return a "I need details" clarifying question
+        # Should return peer messages directly
+        assert len(data["messages"]) == 3
+        for msg in data["messages"]:
+            assert "I need a few details" not in msg["content"]
+            assert "no guessing" not in msg["content"]
+
+    def test_normal_mode_stream_emits_peer_events(self, client, set_settings):
+        """Test that the stream endpoint sends one SSE event per peer, then done"""
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='')
+        response = client.post(
+            "/ui/api/multi-agent/stream",
+            headers=AUTH_HEADERS,
+            json={
+                "text": "What's a good price for a micro-SaaS?",
+                "user_id": "test-user"
+            }
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        messages, done = parse_sse(response.text)
+        assert tuple(msg["agent"] for msg in messages) == PEER_AGENTS
+        assert all(MESSAGE_FIELDS <= msg.keys() for msg in messages)
+        assert done["provider"] == "template"
+        assert done["peers_unavailable"] is False
+        assert UUID4_RE.match(done["trace_id"])
+
+
+@pytest.mark.anyio
+class TestMultiAgentStreamOnline:
+    """Test the SSE stream against mocked OpenRouter peers."""
+
+    # Per-peer reply delay (seconds); Gemini answers first, Claude last
+    PEER_DELAYS = {"claude": 0.06, "deepseek": 0.03, "gemini": 0.0}
+
+    async def post_stream(self, async_client, set_settings, respx_mock, peer_reply):
+        """Mock OpenRouter with peer_reply(agent) and return the parsed stream."""
+        async def openrouter_reply(request):
+            agent = MODEL_AGENTS[json.loads(request.content)["model"]]
+            await asyncio.sleep(self.PEER_DELAYS[agent])
+            return peer_reply(agent)
+
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(side_effect=openrouter_reply)
+
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='test-key')
+        response = await async_client.post(
+            "/ui/api/multi-agent/stream",
+            headers=AUTH_JSON_HEADERS,
+            content=QUESTION_BODY
+        )
+        assert response.status_code == 200
+        return parse_sse(response.text)
+
+    async def test_stream_emits_peers_in_completion_order(self, async_client, set_settings, respx_mock):
+        """Test that each peer event is sent when that peer answers, fastest first"""
+        messages, done = await self.post_stream(
+            async_client, set_settings, respx_mock,
+            lambda agent: httpx.Response(200, json=completion_json(ONLINE_REPLIES[agent]))
+        )
+
+        assert tuple(msg["agent"] for msg in messages) == ("gemini", "deepseek", "claude")
+        for msg in messages:
+            assert msg["live"] is True
+            assert msg["content"] == ONLINE_REPLIES[msg["agent"]]
+        assert done["provider"] == "openrouter"
+        assert done["peers_unavailable"] is False
+
+    async def test_stream_rate_limited_peer_emits_unavailable_event(self, async_client, set_settings, respx_mock):
+        """Test that a 429 peer is streamed as an unavailable message while the others stay live"""
+        def peer_reply(agent):
+            if agent == "deepseek":
+                return httpx.Response(429)
+            return httpx.Response(200, json=completion_json(ONLINE_REPLIES[agent]))
+
+        messages, done = await self.post_stream(async_client, set_settings, respx_mock, peer_reply)
+        peers = {msg["agent"]: msg for msg in messages}
+
+        assert peers["deepseek"]["live"] is False
+        assert peers["deepseek"]["unavailable_reason"] == "rate_limited"
+        assert "[Agent unavailable" in peers["deepseek"]["content"]
+        assert peers["claude"]["live"] is True
+        assert peers["gemini"]["live"] is True
+        assert done["peers_unavailable"] is False
+
+    async def test_stream_all_peers_fail_sets_peers_unavailable(self, async_client, set_settings, respx_mock):
+        """Test that the done event reports peers_unavailable when no peer answers"""
+        messages, done = await self.post_stream(
+            async_client, set_settings, respx_mock,
+            lambda agent: httpx.Response(500)
+        )
+
+        assert len(messages) == len(PEER_AGENTS)
+        assert all(msg["unavailable_reason"] == "http_error" for msg in messages)
+        assert done["provider"] == "openrouter"
+        assert done["peers_unavailable"] is True
+
+    async def test_stream_rejects_work_mode(self, async_client, set_settings, respx_mock):
+        """Test that Work mode is rejected instead of silently streaming Normal-mode peers"""
+        route = respx_mock.post(OPENROUTER_CHAT_URL)
+
+        set_settings(quillo_ui_token=TEST_UI_TOKEN, openrouter_api_key='test-key')
+        response = await async_client.post(
+            "/ui/api/multi-agent/stream",
+            headers=AUTH_JSON_HEADERS,
+            content=WORK_QUESTION_BODY
+        )
+        assert response.status_code == 422
+        assert "/ui/api/multi-agent" in response.json()["detail"]
+        assert route.call_count == 0
+
+    async def test_closing_stream_cancels_pending_peers(self, set_settings, respx_mock):
+        """Test that abandoning the stream cancels peer calls still in flight"""
+        cancelled = []
+
+        async def openrouter_reply(request):
+            agent = MODEL_AGENTS[json.loads(request.content)["model"]]
+            if agent != "gemini":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(agent)
+                    raise
+            return httpx.Response(200, json=completion_json(ONLINE_REPLIES[agent]))
+
+        respx_mock.post(OPENROUTER_CHAT_URL).mock(side_effect=openrouter_reply)
+
+        set_settings(openrouter_api_key='test-key')
+        stream = stream_normal_mode_peers("Test question")
+        first = await stream.__anext__()
+        assert first["agent"] == "gemini"
+
+        # Client disconnects after the first event
+        await stream.aclose()
+        await asyncio.sleep(0)
+        assert sorted(cancelled) == ["claude", "deepseek"]
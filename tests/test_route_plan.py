@@ -2,16 +2,12 @@
 Test route and plan endpoints
 """
 import pytest
-from fastapi.testclient import TestClient
-from app import app
-
-client = TestClient(app)
 
 # Test API key for authentication
 TEST_API_KEY = "dev-test-key-12345"
 
 
-def test_route_response_intent():
+def test_route_response_intent(client):
     """Test POST /route with response intent and defuse slot"""
     payload = {
         "text": "Handle this client email and defuse conflict",
@@ -39,7 +35,7 @@ def test_route_response_intent():
         assert data["slots"]["outcome"] == "Defuse"
 
 
-def test_route_rewrite_intent():
+def test_route_rewrite_intent(client):
     """Test POST /route with rewrite intent"""
     payload = {
         "text": "Rewrite this email to be more professional",
@@ -57,7 +53,7 @@ def test_route_rewrite_intent():
     assert data["intent"] == "rewrite"
 
 
-def test_plan_generation():
+def test_plan_generation(client):
     """Test POST /plan returns non-empty steps"""
     payload = {
         "intent": "response",
@@ -91,7 +87,7 @@ def test_plan_generation():
     assert len(data["trace_id"]) > 0
 
 
-def test_plan_with_defuse_slot():
+def test_plan_with_defuse_slot(client):
     """Test POST /plan with Defuse slot includes conflict resolver"""
     payload = {
         "intent": "response",
@@ -114,7 +110,7 @@ def test_plan_with_defuse_slot():
     assert "conflict_resolver" in tool_names
 
 
-def test_route_missing_text():
+def test_route_missing_text(client):
     """Test POST /route with missing text returns 422"""
     payload = {"user_id": "test-user-123"}
 
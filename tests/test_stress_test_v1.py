@@ -10,7 +10,7 @@ Verifies that STRESS TEST v1 activates automatically when consequence is detecte
 6. Free-form chat is preserved when Stress Test not active
 """
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import patch
 
 from quillo_agent.trust_contract import (
     detect_consequence,
@@ -271,8 +271,10 @@ class TestStressTestIntegration:
     @pytest.mark.anyio
     @patch("quillo_agent.routers.ui_proxy.retrieve_evidence")
     @patch("quillo_agent.routers.ui_proxy.run_multi_agent_chat")
-    async def test_stress_test_respects_evidence_default_on(self, mock_multi_agent, mock_evidence):
-        """Test that Stress Test respects evidence default-on when factual claims present"""
+    async def test_stress_test_respects_evidence_default_on(self, mock_multi_agent, mock_evidence, set_settings):
+        """Test that Stress Test respects evidence default-on when factual claims present (online Work mode)"""
+        # Evidence is only fetched when a live provider will use it
+        set_settings(openrouter_api_key='test-key')
         from quillo_agent.routers.ui_proxy import ui_multi_agent_chat
         from quillo_agent.schemas import MultiAgentRequest, EvidenceResponse, EvidenceFact, EvidenceSource
         from fastapi import Request
@@ -302,7 +304,8 @@ class TestStressTestIntegration:
         # Prompt with both consequence AND factual claim (should trigger both)
         payload = MultiAgentRequest(
             text="Should I sue my former employer based on the latest employment law changes in 2026? I was terminated without cause after 5 years, and my contract had a non-compete clause. The company is now competing with my new venture.",
-            user_id="test_user"
+            user_id="test_user",
+            mode="work"
         )
 
         # Call endpoint
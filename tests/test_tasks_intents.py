@@ -3,18 +3,13 @@ Tests for Tasks Module v1 - Task Intent endpoints
 """
 import pytest
 from unittest.mock import patch
-from fastapi.testclient import TestClient
-from quillo_agent.main import create_app
 from quillo_agent.config import settings
 
-app = create_app()
-client = TestClient(app)
-
 # Test UI token
 TEST_UI_TOKEN = "test-ui-token-12345"
 
 
-def test_create_task_intent_success():
+def test_create_task_intent_success(client):
     """Test creating a task intent succeeds with valid token"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -45,7 +40,7 @@ def test_create_task_intent_success():
         assert data["status"] == "approved"  # Default status
 
 
-def test_create_task_intent_minimal():
+def test_create_task_intent_minimal(client):
     """Test creating a task intent with only required field (intent_text)"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -64,7 +59,7 @@ def test_create_task_intent_minimal():
         assert data["status"] == "approved"
 
 
-def test_create_task_intent_empty_text_validation():
+def test_create_task_intent_empty_text_validation(client):
     """Test that empty intent_text is rejected"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -79,7 +74,7 @@ def test_create_task_intent_empty_text_validation():
         assert "empty" in response.json()["detail"].lower()
 
 
-def test_create_task_intent_missing_text_validation():
+def test_create_task_intent_missing_text_validation(client):
     """Test that missing intent_text is rejected"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -93,7 +88,7 @@ def test_create_task_intent_missing_text_validation():
         assert response.status_code == 422
 
 
-def test_list_task_intents_returns_created():
+def test_list_task_intents_returns_created(client):
     """Test that list endpoint returns created task intents"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task intent
@@ -130,7 +125,7 @@ def test_list_task_intents_returns_created():
         assert matching_item["user_key"] == "list-test-user"
 
 
-def test_list_task_intents_global():
+def test_list_task_intents_global(client):
     """Test that list without user_key returns global recent intents"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task intent
@@ -157,7 +152,7 @@ def test_list_task_intents_global():
         assert len(data) > 0
 
 
-def test_list_task_intents_respects_limit():
+def test_list_task_intents_respects_limit(client):
     """Test that limit parameter is respected"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # List with limit=1
@@ -172,7 +167,7 @@ def test_list_task_intents_respects_limit():
         assert len(data) <= 1
 
 
-def test_create_task_intent_requires_auth():
+def test_create_task_intent_requires_auth(client):
     """Test that create endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -186,7 +181,7 @@ def test_create_task_intent_requires_auth():
             assert response.status_code == 401
 
 
-def test_list_task_intents_requires_auth():
+def test_list_task_intents_requires_auth(client):
     """Test that list endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -195,7 +190,7 @@ def test_list_task_intents_requires_auth():
             assert response.status_code == 401
 
 
-def test_task_intent_status_defaults_to_approved():
+def test_task_intent_status_defaults_to_approved(client):
     """Test that newly created task intents have status=approved by default"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -214,7 +209,7 @@ def test_task_intent_status_defaults_to_approved():
 
 # Task Scope v1 Tests
 
-def test_scope_auto_generated_when_not_provided():
+def test_scope_auto_generated_when_not_provided(client):
     """Test that scope fields are auto-generated when not provided"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -241,7 +236,7 @@ def test_scope_auto_generated_when_not_provided():
         assert len(data["scope_done_when"]) > 0
 
 
-def test_scope_wont_do_contains_safety_bullets():
+def test_scope_wont_do_contains_safety_bullets(client):
     """Test that scope_wont_do contains safety guardrails"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -263,7 +258,7 @@ def test_scope_wont_do_contains_safety_bullets():
         assert "won't log into accounts" in wont_do_text or "won't make purchases" in wont_do_text
 
 
-def test_scope_keyword_shaping_email():
+def test_scope_keyword_shaping_email(client):
     """Test that email-related keywords add specific scope bullets"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -284,7 +279,7 @@ def test_scope_keyword_shaping_email():
         assert "message" in will_do_text or "reply" in will_do_text or "draft" in will_do_text
 
 
-def test_scope_keyword_shaping_summarize():
+def test_scope_keyword_shaping_summarize(client):
     """Test that summarize keywords add specific scope bullets"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -305,7 +300,7 @@ def test_scope_keyword_shaping_summarize():
         assert "summarize" in will_do_text or "extract" in will_do_text or "action items" in will_do_text
 
 
-def test_scope_keyword_shaping_negotiate():
+def test_scope_keyword_shaping_negotiate(client):
     """Test that negotiate/argue keywords add specific scope bullets"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -326,7 +321,7 @@ def test_scope_keyword_shaping_negotiate():
         assert "case" in will_do_text or "structured" in will_do_text or "options" in will_do_text
 
 
-def test_scope_max_five_bullets_enforced():
+def test_scope_max_five_bullets_enforced(client):
     """Test that scope lists enforce max 5 bullets"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -345,7 +340,7 @@ def test_scope_max_five_bullets_enforced():
         assert len(data["scope_wont_do"]) <= 5
 
 
-def test_scope_custom_values_accepted():
+def test_scope_custom_values_accepted(client):
     """Test that custom scope values can be provided instead of auto-generation"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         custom_will_do = ["Custom action 1", "Custom action 2"]
@@ -371,7 +366,7 @@ def test_scope_custom_values_accepted():
         assert data["scope_done_when"] == custom_done_when
 
 
-def test_scope_returned_in_list_endpoint():
+def test_scope_returned_in_list_endpoint(client):
     """Test that scope fields are returned in list endpoint"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task intent
@@ -407,7 +402,7 @@ def test_scope_returned_in_list_endpoint():
 
 # Approval Mode Snapshot v1 Tests
 
-def test_approval_mode_defaults_to_plan_then_auto():
+def test_approval_mode_defaults_to_plan_then_auto(client):
     """Test that approval_mode defaults to plan_then_auto when no prefs exist"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -426,7 +421,7 @@ def test_approval_mode_defaults_to_plan_then_auto():
         assert data["approval_mode"] == "plan_then_auto"
 
 
-def test_approval_mode_snapshots_current_pref():
+def test_approval_mode_snapshots_current_pref(client):
     """Test that approval_mode is snapshotted from current user prefs"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # First, set user prefs to confirm_every_step
@@ -455,7 +450,7 @@ def test_approval_mode_snapshots_current_pref():
         assert task_data["approval_mode"] == "confirm_every_step"
 
 
-def test_approval_mode_snapshot_is_immutable():
+def test_approval_mode_snapshot_is_immutable(client):
     """Test that changing user prefs doesn't affect existing tasks"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Set initial prefs to plan_then_auto
@@ -519,7 +514,7 @@ def test_approval_mode_snapshot_is_immutable():
         assert task2["approval_mode"] == "auto_lowrisk_confirm_highrisk"
 
 
-def test_approval_mode_returned_in_list_endpoint():
+def test_approval_mode_returned_in_list_endpoint(client):
     """Test that approval_mode is returned in list endpoint"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task intent
@@ -552,7 +547,7 @@ def test_approval_mode_returned_in_list_endpoint():
 
 # Task Plan v2 Phase 1 Tests
 
-def test_create_plan_success():
+def test_create_plan_success(client):
     """Test creating a task plan succeeds with valid token and task"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # First create a task intent
@@ -590,7 +585,7 @@ def test_create_plan_success():
         assert len(plan_data["plan_steps"]) > 0
 
 
-def test_create_plan_deterministic_output():
+def test_create_plan_deterministic_output(client):
     """Test that plan generation produces deterministic keyword-based output"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task with email keywords
@@ -621,7 +616,7 @@ def test_create_plan_deterministic_output():
         assert any(kw in summary_lower for kw in ["email", "reply", "response", "draft"])
 
 
-def test_create_plan_replaces_existing_idempotently():
+def test_create_plan_replaces_existing_idempotently(client):
     """Test that creating a plan multiple times replaces the previous plan (idempotent)"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task
@@ -662,7 +657,7 @@ def test_create_plan_replaces_existing_idempotently():
         assert get_response.json()["id"] == plan1_id
 
 
-def test_get_plan_success():
+def test_get_plan_success(client):
     """Test getting a plan returns correct data"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create task and plan
@@ -695,7 +690,7 @@ def test_get_plan_success():
         assert plan_data["status"] == "draft"
 
 
-def test_get_plan_404_when_none_exists():
+def test_get_plan_404_when_none_exists(client):
     """Test that GET plan returns 404 when no plan exists for task"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create a task but don't create a plan
@@ -717,7 +712,7 @@ def test_get_plan_404_when_none_exists():
         assert "No plan found" in get_response.json()["detail"]
 
 
-def test_plan_steps_contract_shape():
+def test_plan_steps_contract_shape(client):
     """Test that plan_steps have correct contract structure"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create task and plan
@@ -751,7 +746,7 @@ def test_plan_steps_contract_shape():
             assert len(step["description"]) > 0
 
 
-def test_create_plan_requires_auth():
+def test_create_plan_requires_auth(client):
     """Test that create plan endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -770,7 +765,7 @@ def test_create_plan_requires_auth():
             assert response.status_code == 401
 
 
-def test_get_plan_requires_auth():
+def test_get_plan_requires_auth(client):
     """Test that get plan endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -794,7 +789,7 @@ def test_get_plan_requires_auth():
             assert response.status_code == 401
 
 
-def test_create_plan_404_for_nonexistent_task():
+def test_create_plan_404_for_nonexistent_task(client):
     """Test that creating plan for non-existent task returns 404"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         fake_task_id = "00000000-0000-0000-0000-000000000000"
@@ -810,7 +805,7 @@ def test_create_plan_404_for_nonexistent_task():
 
 # Task Plan Approval v1 Tests (Phase 2)
 
-def test_approve_plan_success():
+def test_approve_plan_success(client):
     """Test approving a plan succeeds (draft -> approved)"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create task and plan
@@ -840,7 +835,7 @@ def test_approve_plan_success():
         assert "approved_at" in plan_data
 
 
-def test_approve_plan_idempotent():
+def test_approve_plan_idempotent(client):
     """Test that approving an already approved plan is idempotent"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create task and plan
@@ -877,7 +872,7 @@ def test_approve_plan_idempotent():
         assert second_data["approved_at"] == first_approved_at
 
 
-def test_approve_plan_404_when_no_plan():
+def test_approve_plan_404_when_no_plan(client):
     """Test that approving when no plan exists returns 404"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create task but don't create plan
@@ -897,7 +892,7 @@ def test_approve_plan_404_when_no_plan():
         assert "No plan found" in approve_response.json()["detail"]
 
 
-def test_approve_plan_requires_auth():
+def test_approve_plan_requires_auth(client):
     """Test that approve plan endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -909,7 +904,8 @@ def test_approve_plan_requires_auth():
             assert response.status_code == 401
 
 
-def test_get_plan_returns_approved_at():
+@pytest.mark.slow
+def test_get_plan_returns_approved_at(client):
     """Test that GET plan returns approved_at field after approval"""
     import time
     time.sleep(2)  # Avoid rate limit in full test suite
@@ -9,7 +9,7 @@ Verifies trust-first judgment system behaviors:
 5. Clear limitations when Evidence unavailable
 """
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import patch
 
 from quillo_agent.trust_contract import (
     classify_prompt_needs_evidence,
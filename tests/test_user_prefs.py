@@ -3,18 +3,13 @@ Tests for User Preferences Module v1 - /ui/api/prefs endpoints
 """
 import pytest
 from unittest.mock import patch
-from fastapi.testclient import TestClient
-from quillo_agent.main import create_app
 from quillo_agent.config import settings
 
-app = create_app()
-client = TestClient(app)
-
 # Test UI token
 TEST_UI_TOKEN = "test-ui-token-12345"
 
 
-def test_get_prefs_default_is_plan_then_auto():
+def test_get_prefs_default_is_plan_then_auto(client):
     """Test that default approval_mode is plan_then_auto when prefs don't exist"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.get(
@@ -35,7 +30,7 @@ def test_get_prefs_default_is_plan_then_auto():
         assert data["approval_mode"] == "plan_then_auto"
 
 
-def test_post_prefs_updates_value():
+def test_post_prefs_updates_value(client):
     """Test that POST updates the approval_mode value and persists it"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # Create/update preferences
@@ -61,7 +56,7 @@ def test_post_prefs_updates_value():
         assert get_data["approval_mode"] == "confirm_every_step"
 
 
-def test_post_prefs_invalid_value_rejected():
+def test_post_prefs_invalid_value_rejected(client):
     """Test that invalid approval_mode values are rejected with 422"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.post(
@@ -74,7 +69,7 @@ def test_post_prefs_invalid_value_rejected():
         assert "invalid" in response.json()["detail"].lower()
 
 
-def test_get_prefs_requires_auth():
+def test_get_prefs_requires_auth(client):
     """Test that GET /prefs endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -83,7 +78,7 @@ def test_get_prefs_requires_auth():
             assert response.status_code == 401
 
 
-def test_post_prefs_requires_auth():
+def test_post_prefs_requires_auth(client):
     """Test that POST /prefs endpoint requires authentication"""
     with patch.object(settings, 'app_env', 'prod'):
         with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
@@ -95,7 +90,7 @@ def test_post_prefs_requires_auth():
             assert response.status_code == 401
 
 
-def test_prefs_all_valid_modes():
+def test_prefs_all_valid_modes(client):
     """Test that all three approval modes are accepted"""
     valid_modes = ["confirm_every_step", "plan_then_auto", "auto_lowrisk_confirm_highrisk"]
 
@@ -111,7 +106,7 @@ def test_prefs_all_valid_modes():
             assert data["approval_mode"] == mode
 
 
-def test_prefs_defaults_to_global_user_key():
+def test_prefs_defaults_to_global_user_key(client):
     """Test that user_key defaults to 'global' if not provided"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         response = client.get(
@@ -124,7 +119,7 @@ def test_prefs_defaults_to_global_user_key():
         assert data["approval_mode"] == "plan_then_auto"
 
 
-def test_prefs_upsert_behavior():
+def test_prefs_upsert_behavior(client):
     """Test that POST creates or updates preferences"""
     with patch.object(settings, 'quillo_ui_token', TEST_UI_TOKEN):
         # First POST - creates